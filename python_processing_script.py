@@ -1,40 +1,170 @@
-from saxonche import PySaxonProcessor
+import os
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 
-def validate_xml_with_xslt(xml_file_path, xslt_file_path, output_file_path=None, parameters=None):
+from saxonche import PySaxonProcessor, PySaxonApiError
+
+# Saxon processor shared by every transform; kept alive for the lifetime of the process
+_PROC = PySaxonProcessor(license=False)
+
+# Compiled stylesheets keyed by (path, mtime, SEF mtime) so an edited or re-exported stylesheet is recompiled
+_XSLT_CACHE = {}
+
+def _sef_mtime(sef_path):
     """
-    Validate XML using XSLT via Saxon-C
+    Return the modification time of a precompiled stylesheet, or None if it is missing
+    """
+    try:
+        return os.stat(sef_path).st_mtime
+    except OSError:
+        return None
+
+def _get_executable(xslt_file_path):
+    """
+    Return the compiled stylesheet for an XSLT file, compiling it on first use
+    
+    If a precompiled SEF sibling (diggs-validation.xsl -> diggs-validation.sef)
+    is at least as new as the XSLT it is loaded instead of compiling the source.
+    Export one with Saxon-EE:
+        java net.sf.saxon.Transform -xsl:diggs-validation.xsl -export:diggs-validation.sef -target:HE -nogo
     
     Args:
-        xml_file_path: Path to the XML file to validate
         xslt_file_path: Path to the XSLT stylesheet
-        output_file_path: Optional path to save the validation report
-        parameters: Optional dictionary of parameters to pass to the XSLT
     
     Returns:
-        The validation result as a string
+        The cached PyXsltExecutable
     """
-    # Create a Saxon processor
-    with PySaxonProcessor(license=False) as proc:
-        # Create an XSLT compiler
-        xslt = proc.new_xslt30_processor()
-        
-        # Set parameters if provided
-        if parameters:
-            for key, value in parameters.items():
-                xslt.set_parameter(key, proc.make_string_value(value))
+    path = os.path.abspath(xslt_file_path)
+    sef_path = os.path.splitext(path)[0] + '.sef'
+    mtime = os.stat(path).st_mtime
+    sef_mtime = _sef_mtime(sef_path)
+    key = (path, mtime, sef_mtime)
+    
+    executable = _XSLT_CACHE.get(key)
+    if executable is None:
+        # Drop any executable compiled from an older version of this file
+        for stale_key in [k for k in _XSLT_CACHE if k[0] == path]:
+            del _XSLT_CACHE[stale_key]
         
-        # Compile the stylesheet
-        executable = xslt.compile_stylesheet(stylesheet_file=xslt_file_path)
+        if sef_mtime is not None and sef_mtime >= mtime:
+            try:
+                executable = _PROC.new_xslt30_processor().compile_stylesheet(stylesheet_file=sef_path)
+            except PySaxonApiError as e:
+                print(f"Could not load {sef_path}, compiling {path} instead: {e}")
+        if executable is None:
+            executable = _PROC.new_xslt30_processor().compile_stylesheet(stylesheet_file=path)
+        _XSLT_CACHE[key] = executable
+    
+    return executable
+
+def validate_many(pairs, xslt_file_path, parameters=None, return_results=True):
+    """
+    Validate a batch of XML files using XSLT via Saxon-C
+    
+    This is the preferred entry point for validating more than one file: the
+    processor is started and the stylesheet compiled once, and every file in
+    the batch only pays for its own transform.
+    
+    Args:
+        pairs: Iterable of (xml_file_path, output_file_path) tuples; output_file_path may be None
+        xslt_file_path: Path to the XSLT stylesheet
+        parameters: Optional dictionary of parameters to pass to the XSLT
+        return_results: If False, files with an output path are written by Saxon
+            directly and their result is None
+    
+    Returns:
+        List of validation results as strings, in input order
+    """
+    # Fetch the compiled stylesheet (compiled once per process)
+    executable = _get_executable(xslt_file_path)
+    
+    # Parameters live on the executable, so reset them once for the batch
+    executable.clear_parameters()
+    if parameters:
+        for key, value in parameters.items():
+            executable.set_parameter(key, _PROC.make_string_value(value))
+    
+    results = []
+    for xml_file_path, output_file_path in pairs:
+        if output_file_path and not return_results:
+            # Let Saxon serialize straight to disk; the report never becomes a Python string
+            executable.transform_to_file(source_file=xml_file_path,
+                                         output_file=os.path.abspath(output_file_path))
+            results.append(None)
+            continue
         
         # Transform the XML
         result = executable.transform_to_string(source_file=xml_file_path)
         
         # Save the result if output path is specified
         if output_file_path:
-            with open(output_file_path, 'w', encoding='utf-8') as f:
-                f.write(result)
+            with open(output_file_path, 'wb', buffering=1 << 20) as f:
+                f.write(result.encode('utf-8'))
         
-        return result
+        results.append(result)
+    
+    return results
+
+def validate_xml_with_xslt(xml_file_path, xslt_file_path, output_file_path=None, parameters=None):
+    """
+    Validate XML using XSLT via Saxon-C
+    
+    Single-file wrapper around validate_many.
+    
+    Args:
+        xml_file_path: Path to the XML file to validate
+        xslt_file_path: Path to the XSLT stylesheet
+        output_file_path: Optional path to save the validation report
+        parameters: Optional dictionary of parameters to pass to the XSLT
+    
+    Returns:
+        The validation result as a string
+    """
+    return validate_many([(xml_file_path, output_file_path)], xslt_file_path, parameters)[0]
+
+def _validate_chunk(pairs, xslt_file_path, parameters):
+    """Worker task for validate_parallel: validate one chunk of files, returning the output paths"""
+    validate_many(pairs, xslt_file_path, parameters, return_results=False)
+    return [output_file_path for _, output_file_path in pairs]
+
+def validate_parallel(file_list, xslt_file_path, out_dir, parameters=None, workers=os.cpu_count()):
+    """
+    Validate many XML files in parallel using a pool of worker processes
+    
+    Each worker runs its own Saxon processor and compiles the stylesheet once on
+    its first chunk, then reuses it for every later chunk it receives. Files are
+    handed out in chunks so only one file per worker is open at any time.
+    
+    Args:
+        file_list: List of XML file paths to validate
+        xslt_file_path: Path to the XSLT stylesheet
+        out_dir: Directory where the validation reports are written as <name>-validation.xml
+        parameters: Optional dictionary of parameters to pass to the XSLT
+        workers: Number of worker processes (defaults to the number of CPUs)
+    
+    Returns:
+        List of report file paths, in input order
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    
+    pairs = []
+    for xml_file_path in file_list:
+        name = os.path.splitext(os.path.basename(xml_file_path))[0]
+        pairs.append((xml_file_path, os.path.join(out_dir, f"{name}-validation.xml")))
+    
+    if not pairs:
+        return []
+    
+    workers = max(1, min(workers or 1, len(pairs)))
+    chunksize = max(1, len(pairs) // (workers * 4))
+    chunks = [pairs[i:i + chunksize] for i in range(0, len(pairs), chunksize)]
+    
+    # Spawn (rather than fork) so every worker starts its own Saxon runtime
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+        task = partial(_validate_chunk, xslt_file_path=xslt_file_path, parameters=parameters)
+        return [path for chunk in executor.map(task, chunks) for path in chunk]
 
 # Example usage
 if __name__ == "__main__":
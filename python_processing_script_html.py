@@ -1,40 +1,6 @@
-from saxonche import PySaxonProcessor
+import os
 
-def validate_xml_with_xslt(xml_file_path, xslt_file_path, output_file_path=None, parameters=None):
-    """
-    Validate XML using XSLT via Saxon-C
-    
-    Args:
-        xml_file_path: Path to the XML file to validate
-        xslt_file_path: Path to the XSLT stylesheet
-        output_file_path: Optional path to save the validation report
-        parameters: Optional dictionary of parameters to pass to the XSLT
-    
-    Returns:
-        The validation result as a string
-    """
-    # Create a Saxon processor
-    with PySaxonProcessor(license=False) as proc:
-        # Create an XSLT compiler
-        xslt = proc.new_xslt30_processor()
-        
-        # Set parameters if provided
-        if parameters:
-            for key, value in parameters.items():
-                xslt.set_parameter(key, proc.make_string_value(value))
-        
-        # Compile the stylesheet
-        executable = xslt.compile_stylesheet(stylesheet_file=xslt_file_path)
-        
-        # Transform the XML
-        result = executable.transform_to_string(source_file=xml_file_path)
-        
-        # Save the result if output path is specified
-        if output_file_path:
-            with open(output_file_path, 'w', encoding='utf-8') as f:
-                f.write(result)
-        
-        return result
+from python_processing_script import validate_xml_with_xslt, _get_executable
 
 def generate_html_report(xml_validation_report, html_xslt_path, html_output_path):
     """
@@ -49,23 +15,15 @@ def generate_html_report(xml_validation_report, html_xslt_path, html_output_path
         True if successful, False otherwise
     """
     try:
-        # Create a Saxon processor for HTML transformation
-        with PySaxonProcessor(license=False) as proc:
-            # Create an XSLT compiler
-            xslt = proc.new_xslt30_processor()
-            
-            # Compile the HTML stylesheet
-            executable = xslt.compile_stylesheet(stylesheet_file=html_xslt_path)
-            
-            # Transform the XML to HTML
-            html_result = executable.transform_to_string(source_file=xml_validation_report)
-            
-            # Save the HTML result
-            with open(html_output_path, 'w', encoding='utf-8') as f:
-                f.write(html_result)
-            
-            print(f"HTML report generated successfully: {html_output_path}")
-            return True
+        # Fetch the compiled HTML stylesheet (compiled once per process)
+        executable = _get_executable(html_xslt_path)
+        
+        # Transform the XML to HTML, serializing straight to the output file
+        executable.transform_to_file(source_file=xml_validation_report,
+                                     output_file=os.path.abspath(html_output_path))
+        
+        print(f"HTML report generated successfully: {html_output_path}")
+        return True
     except Exception as e:
         print(f"Error generating HTML report: {e}")
         return False
@@ -5,9 +5,23 @@ This script can be run on any server to test the Units API functionality
 """
 
 import requests
+from requests.adapters import HTTPAdapter
 import json
+import orjson
 import argparse
+import io
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# Shared session so every call reuses pooled keep-alive connections
+SESSION = requests.Session()
+SESSION.mount('https://', HTTPAdapter(pool_connections=16, pool_maxsize=32))
+SESSION.mount('http://', HTTPAdapter(pool_connections=16, pool_maxsize=32))
+
+def _pretty(data):
+    """Indent a decoded JSON body for printing"""
+    return orjson.dumps(data, option=orjson.OPT_INDENT_2).decode()
 
 def print_response(response, verbose=False):
     """Pretty print API response"""
@@ -18,9 +32,9 @@ def print_response(response, verbose=False):
             print(f"  {header}: {value}")
     
     try:
-        data = response.json()
+        data = orjson.loads(response.content)
         print("Response body:")
-        print(json.dumps(data, indent=2))
+        print(_pretty(data))
     except:
         print("Response body (raw):")
         print(response.text)
@@ -41,7 +55,7 @@ def test_convert_units_post(base_url, api_key, source_value, source_unit, target
     print(f"Request payload: {json.dumps(payload, indent=2)}")
     
     try:
-        response = requests.post(url, json=payload, headers=headers)
+        response = SESSION.post(url, json=payload, headers=headers)
         print_response(response, verbose)
         return response.status_code == 200
     except Exception as e:
@@ -63,7 +77,7 @@ def test_convert_units_get(base_url, api_key, source_value, source_unit, target_
     print(f"Query parameters: {params}")
     
     try:
-        response = requests.get(url, params=params, headers=headers)
+        response = SESSION.get(url, params=params, headers=headers)
         print_response(response, verbose)
         return response.status_code == 200
     except Exception as e:
@@ -79,7 +93,7 @@ def test_get_units_by_class(base_url, api_key, quantity_class, verbose=False):
     print(f"GET {url}")
     
     try:
-        response = requests.get(url, headers=headers)
+        response = SESSION.get(url, headers=headers)
         print_response(response, verbose)
         return response.status_code == 200
     except Exception as e:
@@ -95,7 +109,7 @@ def test_list_quantity_classes(base_url, api_key, verbose=False):
     print(f"GET {url}")
     
     try:
-        response = requests.get(url, headers=headers)
+        response = SESSION.get(url, headers=headers)
         print_response(response, verbose)
         return response.status_code == 200
     except Exception as e:
@@ -111,45 +125,78 @@ def test_health_check(base_url, api_key, verbose=False):
     print(f"GET {url}")
     
     try:
-        response = requests.get(url, headers=headers)
+        response = SESSION.get(url, headers=headers)
         print_response(response, verbose)
         return response.status_code == 200
     except Exception as e:
         print(f"Error: {e}")
         return False
 
-def run_all_tests(base_url, api_key, verbose=False):
-    """Run all API tests"""
-    results = {}
-    
-    # Test health check
-    results["health_check"] = test_health_check(base_url, api_key, verbose)
-    
-    # Test unit conversion (both POST and GET methods)
-    results["convert_post"] = test_convert_units_post(base_url, api_key, 10.0, "ft", "m", verbose)
-    results["convert_get"] = test_convert_units_get(base_url, api_key, 10.0, "ft", "m", verbose)
-    
-    # Test listing quantity classes
-    results["list_classes"] = test_list_quantity_classes(base_url, api_key, verbose)
-    
-    # Test getting units by class
-    # First try to get the classes to find one to use
+def test_units_of_first_class(base_url, api_key, verbose=False):
+    """Look up the first quantity class and test getting its units"""
     try:
-        response = requests.get(f"{base_url}/api/units/classes", headers={"X-API-Key": api_key})
+        response = SESSION.get(f"{base_url}/api/units/classes", headers={"X-API-Key": api_key})
         if response.status_code == 200:
             classes = response.json()
             if classes and len(classes) > 0:
                 test_class = classes[0]["name"]
-                results["get_units"] = test_get_units_by_class(base_url, api_key, test_class, verbose)
-            else:
-                results["get_units"] = False
-                print("No quantity classes found for testing")
+                return test_get_units_by_class(base_url, api_key, test_class, verbose)
+            print("No quantity classes found for testing")
         else:
-            results["get_units"] = False
             print("Could not retrieve quantity classes for testing")
     except Exception as e:
-        results["get_units"] = False
         print(f"Error while retrieving quantity classes: {e}")
+    return False
+
+class _ThreadOutput:
+    """stdout proxy that lets worker threads print into their own buffer"""
+    def __init__(self, stream):
+        self._stream = stream
+        self._local = threading.local()
+
+    def capture(self):
+        self._local.buffer = io.StringIO()
+        return self._local.buffer
+
+    def write(self, text):
+        buffer = getattr(self._local, "buffer", None)
+        return (buffer or self._stream).write(text)
+
+    def flush(self):
+        self._stream.flush()
+
+def _run_captured(output, test, *args):
+    """Run one test in a worker thread and return (result, printed output)"""
+    buffer = output.capture()
+    try:
+        return test(*args), buffer.getvalue()
+    except Exception as e:
+        return False, buffer.getvalue() + f"Error: {e}\n"
+
+def run_all_tests(base_url, api_key, verbose=False):
+    """Run all API tests concurrently and report them in a fixed order"""
+    tests = {
+        "health_check": (test_health_check, base_url, api_key, verbose),
+        # Test unit conversion (both POST and GET methods)
+        "convert_post": (test_convert_units_post, base_url, api_key, 10.0, "ft", "m", verbose),
+        "convert_get": (test_convert_units_get, base_url, api_key, 10.0, "ft", "m", verbose),
+        "list_classes": (test_list_quantity_classes, base_url, api_key, verbose),
+        "get_units": (test_units_of_first_class, base_url, api_key, verbose),
+    }
+    
+    # The tests are independent HTTP calls sharing SESSION, so overlap their round trips.
+    # Each test prints into its own buffer and the buffers are replayed in order.
+    output = _ThreadOutput(sys.stdout)
+    sys.stdout = output
+    try:
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            futures = {name: executor.submit(_run_captured, output, *test) for name, test in tests.items()}
+            results = {}
+            for name, future in futures.items():
+                results[name], printed = future.result()
+                print(printed, end="")
+    finally:
+        sys.stdout = output._stream
     
     # Print summary
     print("\n=== Test Results Summary ===")
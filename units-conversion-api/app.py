@@ -4,12 +4,17 @@ Units Conversion API
 This API converts values between different units using the DIGGS Units Dictionary.
 """
 
-from flask import Flask, request, jsonify
+from flask import Flask, request
 import requests
-import xml.etree.ElementTree as ET
+import lxml.etree as ET
 import logging
+import os
+import threading
 from functools import lru_cache
 
+import numpy as np
+import orjson
+
 app = Flask(__name__)
 
 # Configure logging
@@ -19,28 +24,68 @@ logger = logging.getLogger(__name__)
 # URL for the DIGGS Units Dictionary
 UNITS_DICTIONARY_URL = 'https://diggsml.org/def/units/DiggsUomDictionary.xml'
 
+# Keep-alive connection pool reused for every dictionary download
+_SESSION = requests.Session()
+
+# (connect, read) timeouts in seconds for dictionary downloads; the read timeout
+# applies to each socket read, so a stalled server raises instead of hanging
+HTTP_TIMEOUT = (5, 30)
+
 # Dictionary cache
 units_dictionary = None
 
+# Lookup tables built once from the dictionary (see load_units_index)
+UNITS = {}
+CLASSES = {}
+CLASSES_CI = {}
+UNIT_CLASSES = {}
+dictionary_version = 0
+_indexed_root = None
+_index_lock = threading.RLock()
+# Stands in for the root of a dictionary that was indexed while streaming
+_STREAMED_INDEX = object()
 
-@lru_cache(maxsize=1)
-def fetch_units_dictionary():
+# Background refresh of the dictionary (see start_background_refresh)
+REFRESH_INTERVAL_SECONDS = 6 * 60 * 60
+_refresh_thread = None
+_refresh_stop = threading.Event()
+
+# Longest unit symbol accepted in a request
+MAX_UNIT_SYMBOL_LENGTH = 64
+
+# Parser for the remote dictionary; never expand entities from the network
+_PARSER = ET.XMLParser(resolve_entities=False)
+
+# Precompiled XPaths; local-name() matches with or without the dictionary namespace
+_XP_QUANTITY_CLASSES = ET.XPath("//*[local-name()='quantityClass']")
+_XP_QUANTITY_CLASS_FIELDS = ET.XPath(
+    "*[local-name()='name' or local-name()='baseForConversion' or local-name()='memberUnit']"
+)
+_XP_UNITS = ET.XPath("//*[local-name()='unit']")
+_XP_UNIT_FIELDS = ET.XPath(
+    "*[local-name()='symbol' or local-name()='isBase' or local-name()='isExact'"
+    " or local-name()='A' or local-name()='B' or local-name()='C' or local-name()='D']"
+)
+
+
+def fastjson(obj, status=200):
     """
-    Fetch and parse the units dictionary from the URL
-    Returns a parsed XML tree
+    Build a JSON response serialized with orjson
+    """
+    return app.response_class(orjson.dumps(obj), status=status, mimetype='application/json')
+
+
+def download_units_dictionary():
+    """
+    Download and parse the full units dictionary document from the URL
+    Returns the parsed XML root without publishing it
     """
-    global units_dictionary
-    if units_dictionary is not None:
-        return units_dictionary
-    
     try:
-        response = requests.get(UNITS_DICTIONARY_URL)
+        response = _SESSION.get(UNITS_DICTIONARY_URL, timeout=HTTP_TIMEOUT)
         response.raise_for_status()
         
         # Parse XML
-        root = ET.fromstring(response.content)
-        units_dictionary = root
-        return root
+        return ET.fromstring(response.content, _PARSER)
     except requests.RequestException as e:
         logger.error(f"Error fetching units dictionary: {e}")
         raise Exception("Failed to fetch units dictionary")
@@ -49,120 +94,257 @@ def fetch_units_dictionary():
         raise Exception("Failed to parse units dictionary")
 
 
-def units_in_same_quantity_class(root, source_unit, target_unit):
+def fetch_units_dictionary():
     """
-    Check if source and target units belong to the same quantity class
-    Returns the quantity class element if found, None otherwise
+    Return the units dictionary as a parsed XML tree
+    Downloaded once on first use; the request path only falls back to this
+    before the background refresh has published an index
+    """
+    global units_dictionary
+    root = units_dictionary
+    if root is None:
+        root = units_dictionary = download_units_dictionary()
+    return root
+
+
+def _index_quantity_class(quantity_class, classes):
     """
-    # Determine namespace
-    namespace = ""
-    if "}" in root.tag:
-        namespace = root.tag.split("}")[0] + "}"
+    Add one quantityClass element to the classes table, keeping the first
+    record for a repeated name
+    """
+    name = None
+    base_unit = None
+    member_units = []
+    for child in _XP_QUANTITY_CLASS_FIELDS(quantity_class):
+        tag = ET.QName(child).localname
+        if tag == 'name':
+            name = child.text
+        elif tag == 'baseForConversion':
+            base_unit = child.text
+        else:
+            member_units.append(child.text)
+    
+    if name is not None and name not in classes:
+        classes[name] = {
+            'name': name,
+            'base': base_unit,
+            'members': set(member_units),
+            'members_list': member_units
+        }
+
+
+def _index_unit(unit, units):
+    """
+    Add one unit element to the units table, keeping the first record for a
+    repeated symbol
+    """
+    symbol = None
+    is_base = False
+    # Conversion parameters with safe defaults
+    params = {
+        "isBase": False,
+        "A": 0,
+        "B": 0,
+        "C": 0,
+        "D": 0,
+        "isExact": False
+    }
     
-    # Find the quantityClassSet element first
-    quantity_class_set = None
-    for child in root:
-        if child.tag.endswith('quantityClassSet'):
-            quantity_class_set = child
-            break
+    for child in _XP_UNIT_FIELDS(unit):
+        tag = ET.QName(child).localname
+        if tag == 'symbol':
+            symbol = child.text
+        elif tag == 'isBase':
+            is_base = True
+        elif tag == 'isExact':
+            if child.text:
+                params["isExact"] = child.text.lower() == 'true'
+        elif child.text:
+            params[tag] = float(child.text)
     
-    if quantity_class_set is None:
-        logger.warning("Could not find quantityClassSet element")
-        return None
+    if symbol is not None and symbol not in units:
+        units[symbol] = {"isBase": True} if is_base else params
+
+
+def build_units_index(root):
+    """
+    Walk the dictionary once and build plain lookup tables
+    Returns (units, classes) where units maps a unit symbol to its conversion
+    parameters and classes maps a quantity class name to its record
+    """
+    # Accept trees built by xml.etree as well by re-parsing them into lxml once
+    if not isinstance(root, ET._Element):
+        import xml.etree.ElementTree as StdET
+        root = ET.fromstring(StdET.tostring(root), _PARSER)
+    
+    units = {}
+    classes = {}
+    
+    for quantity_class in _XP_QUANTITY_CLASSES(root):
+        _index_quantity_class(quantity_class, classes)
+    
+    for unit in _XP_UNITS(root):
+        _index_unit(unit, units)
+    
+    logger.info(f"Indexed {len(units)} units and {len(classes)} quantity classes")
+    return units, classes
+
+
+def stream_units_index(source):
+    """
+    Build the (units, classes) lookup tables straight from an XML byte stream
+    Each unit and quantityClass is indexed as soon as it closes and then
+    discarded, so the full document tree is never held in memory
+    """
+    units = {}
+    classes = {}
     
-    # Check each quantity class
-    for quantity_class in quantity_class_set:
-        if not quantity_class.tag.endswith('quantityClass'):
-            continue
-            
-        # Get all memberUnit elements
-        member_units = []
-        for elem in quantity_class:
-            if elem.tag.endswith('memberUnit'):
-                member_units.append(elem.text)
+    for _, elem in ET.iterparse(source, events=('end',), tag=('{*}unit', '{*}quantityClass'),
+                                resolve_entities=False):
+        if ET.QName(elem).localname == 'unit':
+            _index_unit(elem, units)
+        else:
+            _index_quantity_class(elem, classes)
         
-        # Check if both source and target units are in this quantity class
-        if source_unit in member_units and target_unit in member_units:
-            logger.info(f"Found compatible quantity class for {source_unit} and {target_unit}")
-            return quantity_class
+        # Drop the element and everything already indexed before it
+        elem.clear()
+        parent = elem.getparent()
+        while elem.getprevious() is not None:
+            del parent[0]
     
-    logger.warning(f"Units {source_unit} and {target_unit} are not in the same quantity class")
-    return None
+    logger.info(f"Indexed {len(units)} units and {len(classes)} quantity classes")
+    return units, classes
 
-def get_conversion_parameters(root, unit_symbol):
+
+def _publish_index(root, units, classes):
     """
-    Get conversion parameters for a unit
-    Returns a dictionary with parameters or None if unit not found
+    Swap in freshly built lookup tables for root
+    Callers must hold _index_lock
+    """
+    global UNITS, CLASSES, CLASSES_CI, UNIT_CLASSES, dictionary_version, _indexed_root
+    # Case-folded names for /api/units; the first class wins on a collision
+    classes_ci = {}
+    for name, quantity_class in classes.items():
+        classes_ci.setdefault(name.lower(), quantity_class)
+    # Quantity classes each unit is a member of, in dictionary order
+    unit_classes = {}
+    for quantity_class in classes.values():
+        for member in quantity_class['members_list']:
+            unit_classes.setdefault(member, []).append(quantity_class)
+    UNITS, CLASSES, CLASSES_CI, UNIT_CLASSES = units, classes, classes_ci, unit_classes
+    _indexed_root = root
+    # Results memoized against the previous dictionary are no longer valid
+    dictionary_version += 1
+    _convert_cached.cache_clear()
+    _compose_cached.cache_clear()
+
+
+def refresh_units_dictionary():
+    """
+    Stream the dictionary from the URL, index it off to the side and publish
+    the new tables at once; requests keep using the previous tables until the swap
     """
-    # Determine namespace
-    namespace = ""
-    if "}" in root.tag:
-        namespace = root.tag.split("}")[0] + "}"
+    global units_dictionary
+    try:
+        with _SESSION.get(UNITS_DICTIONARY_URL, stream=True, timeout=HTTP_TIMEOUT) as response:
+            response.raise_for_status()
+            # Let urllib3 undo any gzip/deflate transfer encoding while streaming
+            response.raw.decode_content = True
+            units, classes = stream_units_index(response.raw)
+    except requests.RequestException as e:
+        logger.error(f"Error fetching units dictionary: {e}")
+        raise Exception("Failed to fetch units dictionary")
+    except ET.ParseError as e:
+        logger.error(f"Error parsing XML dictionary: {e}")
+        raise Exception("Failed to parse units dictionary")
     
-    # Find the unitSet element first
-    unit_set = None
-    for child in root:
-        if child.tag.endswith('unitSet'):
-            unit_set = child
-            break
+    with _index_lock:
+        _publish_index(_STREAMED_INDEX, units, classes)
+        # A tree kept from a fallback download is no longer needed
+        units_dictionary = None
+
+
+def _refresh_loop(interval):
+    """
+    Refresh the dictionary now and then every interval seconds
+    An index already published when the thread starts (e.g. preloaded before
+    a fork) counts as the first refresh
+    """
+    refresh_now = _indexed_root is not _STREAMED_INDEX
+    while True:
+        if refresh_now:
+            try:
+                refresh_units_dictionary()
+            except Exception as e:
+                logger.error(f"Background dictionary refresh failed: {e}")
+        refresh_now = True
+        if _refresh_stop.wait(interval):
+            return
+
+
+def start_background_refresh(interval=REFRESH_INTERVAL_SECONDS):
+    """
+    Start the daemon thread that pre-warms and periodically refreshes the dictionary
+    Safe to call more than once; only one thread is started per process
+    """
+    global _refresh_thread
+    with _index_lock:
+        if _refresh_thread is None or not _refresh_thread.is_alive():
+            _refresh_stop.clear()
+            _refresh_thread = threading.Thread(
+                target=_refresh_loop, args=(interval,), name='units-refresh', daemon=True
+            )
+            _refresh_thread.start()
+        return _refresh_thread
+
+
+def load_units_index():
+    """
+    Return the (units, classes) lookup tables for the current dictionary,
+    rebuilding them only when the dictionary itself has changed
+    """
+    # Published tables are read without taking the lock
+    if _indexed_root is _STREAMED_INDEX:
+        return UNITS, CLASSES
     
-    if unit_set is None:
-        logger.warning("Could not find unitSet element")
-        return None
+    root = fetch_units_dictionary()
+    if root is _indexed_root:
+        return UNITS, CLASSES
     
-    # Check each unit
-    for unit in unit_set:
-        if not unit.tag.endswith('unit'):
-            continue
-            
-        # Get symbol element
-        symbol_text = None
-        for elem in unit:
-            if elem.tag.endswith('symbol'):
-                symbol_text = elem.text
-                break
-                
-        if symbol_text is not None and symbol_text == unit_symbol:
-            # Check if this is a base unit
-            is_base = False
-            for elem in unit:
-                if elem.tag.endswith('isBase'):
-                    is_base = True
-                    break
-            
-            if is_base:
-                logger.info(f"Unit {unit_symbol} is a base unit")
-                return {"isBase": True}
-            
-            # Get conversion parameters with safe defaults
-            params = {
-                "isBase": False,
-                "A": 0,
-                "B": 0,
-                "C": 0,
-                "D": 0,
-                "isExact": False
-            }
-            
-            # Process all elements
-            for elem in unit:
-                tag = elem.tag.split('}')[-1]  # Get tag without namespace
-                if tag == 'A' and elem.text:
-                    params["A"] = float(elem.text)
-                elif tag == 'B' and elem.text:
-                    params["B"] = float(elem.text)
-                elif tag == 'C' and elem.text:
-                    params["C"] = float(elem.text)
-                elif tag == 'D' and elem.text:
-                    params["D"] = float(elem.text)
-                elif tag == 'isExact' and elem.text:
-                    params["isExact"] = elem.text.lower() == 'true'
-            
-            logger.info(f"Found conversion parameters for unit {unit_symbol}: {params}")
-            return params
+    with _index_lock:
+        if root is not _indexed_root:
+            units, classes = build_units_index(root)
+            _publish_index(root, units, classes)
+        return UNITS, CLASSES
+
+
+def units_in_same_quantity_class(classes, source_unit, target_unit):
+    """
+    Check if source and target units belong to the same quantity class
+    Returns the quantity class record if found, None otherwise
+    """
+    quantity_class = next(
+        (c for c in classes.values() if source_unit in c['members'] and target_unit in c['members']),
+        None
+    )
     
-    logger.warning(f"Unit {unit_symbol} not found in dictionary")
-    return None
+    if quantity_class is None:
+        logger.warning(f"Units {source_unit} and {target_unit} are not in the same quantity class")
+    return quantity_class
+
+def get_conversion_parameters(units, unit_symbol):
+    """
+    Get conversion parameters for a unit
+    Returns a dictionary with parameters or None if unit not found
+    """
+    params = units.get(unit_symbol)
+    if params is None:
+        logger.warning(f"Unit {unit_symbol} not found in dictionary")
+    return params
+
+class ConversionError(Exception):
+    """Raised when a conversion cannot be performed with the current dictionary"""
+
 
 def convert_to_base_unit(value, params):
     """
@@ -195,6 +377,131 @@ def convert_from_base_unit(base_value, params):
     return (A - C * base_value) / (D * base_value - B)
 
 
+def compose_conversion(source_params, target_params):
+    """
+    Compose the source-to-base and base-to-target formulas into a single
+    rational function y = (P + Qx) / (R + Sx)
+    Returns the coefficients (P, Q, R, S)
+    """
+    # Source to base: b = (A1 + B1x) / (C1 + D1x), identity for a base unit
+    if source_params["isBase"]:
+        A1, B1, C1, D1 = 0.0, 1.0, 1.0, 0.0
+    else:
+        A1, B1, C1, D1 = source_params["A"], source_params["B"], source_params["C"], source_params["D"]
+    
+    # Base to target: z = (A2 - C2b) / (D2b - B2), identity for a base unit
+    if target_params["isBase"]:
+        A2, B2, C2, D2 = 0.0, -1.0, -1.0, 0.0
+    else:
+        A2, B2, C2, D2 = target_params["A"], target_params["B"], target_params["C"], target_params["D"]
+        # Same D=0 special case as convert_from_base_unit
+        if abs(D2) < 1e-10:
+            D2 = 0.0
+    
+    # Substitute b into z and collect the x terms
+    P = A2 * C1 - C2 * A1
+    Q = A2 * D1 - C2 * B1
+    R = D2 * A1 - B2 * C1
+    S = D2 * B1 - B2 * D1
+    return P, Q, R, S
+
+
+@lru_cache(maxsize=4096)
+def _compose_cached(source_unit, target_unit, version):
+    """
+    Composed (P, Q, R, S) coefficients for a unit pair in the current lookup tables
+    Returns None if either unit is missing
+    """
+    source_params = UNITS.get(source_unit)
+    target_params = UNITS.get(target_unit)
+    if source_params is None or target_params is None:
+        return None
+    return compose_conversion(source_params, target_params)
+
+
+@lru_cache(maxsize=8192)
+def _convert_cached(value, source_unit, target_unit, version):
+    """
+    Convert a value between two units using the current lookup tables
+    The dictionary version is part of the cache key so results are never
+    reused across dictionary reloads
+    Returns (target_value, base_value, base_unit, is_exact, quantity_class_name)
+    """
+    quantity_class, source_params, target_params, is_exact = _lookup_conversion(source_unit, target_unit)
+    
+    # Convert to base unit (reported alongside the result)
+    base_value = convert_to_base_unit(value, source_params)
+    
+    if source_unit == target_unit:
+        # Identity conversion; return the input untouched
+        target_value = value
+    elif target_params["isBase"]:
+        # The base value already is the answer
+        target_value = base_value
+    else:
+        # Convert straight to the target unit with the composed formula
+        P, Q, R, S = _compose_cached(source_unit, target_unit, version)
+        target_value = (P + Q * value) / (R + S * value)
+    
+    return target_value, base_value, quantity_class['base'], is_exact, quantity_class['name']
+
+
+def _lookup_conversion(source_unit, target_unit):
+    """
+    Look up everything needed to convert between two units
+    Returns (quantity_class, source_params, target_params, is_exact)
+    Raises ConversionError if the units are incompatible or unknown
+    """
+    # Reject symbols the dictionary has never heard of before any other lookup
+    for unit_symbol in (source_unit, target_unit):
+        if unit_symbol not in UNITS and unit_symbol not in UNIT_CLASSES:
+            logger.warning(f"Unit {unit_symbol} not found in dictionary")
+            raise ConversionError('One or both units not found in dictionary')
+    
+    # Check if units are in the same quantity class
+    quantity_class = next(
+        (c for c in UNIT_CLASSES.get(source_unit, ()) if target_unit in c['members']),
+        None
+    )
+    if quantity_class is None:
+        logger.warning(f"Units {source_unit} and {target_unit} are not in the same quantity class")
+        raise ConversionError('Units are not compatible. They must belong to the same quantity class.')
+    
+    # Get conversion parameters
+    source_params = get_conversion_parameters(UNITS, source_unit)
+    target_params = get_conversion_parameters(UNITS, target_unit)
+    
+    if source_params is None or target_params is None:
+        raise ConversionError('One or both units not found in dictionary')
+    
+    # Determine if conversion is exact -true if one of the and clauses is true
+    is_exact = ((source_params["isBase"] and target_params.get("isExact", False)) or
+               (target_params["isBase"] and source_params.get("isExact", False)) or
+               (source_params.get("isExact", False) and target_params.get("isExact", False)))
+    
+    return quantity_class, source_params, target_params, is_exact
+
+
+def validate_unit_symbols(source_unit, target_unit):
+    """
+    Cheap shape check on the requested unit symbols, done before any dictionary lookup
+    Returns an error message, or None if both look like unit symbols
+    """
+    for unit_symbol in (source_unit, target_unit):
+        if not isinstance(unit_symbol, str) or not 0 < len(unit_symbol) <= MAX_UNIT_SYMBOL_LENGTH:
+            return 'Source and target units must be non-empty unit symbols'
+    return None
+
+
+def convert_array(values, coefficients):
+    """
+    Convert a NumPy array of values using composed (P, Q, R, S) coefficients
+    Formula: y = (P + Qx) / (R + Sx)
+    """
+    P, Q, R, S = coefficients
+    return (P + Q * values) / (R + S * values)
+
+
 @app.route('/api/convert', methods=['GET', 'POST'])
 def convert():
     """
@@ -204,7 +511,7 @@ def convert():
     try:
         # Handle both GET and POST requests
         if request.method == 'POST':
-            data = request.json
+            data = orjson.loads(request.get_data())
         else:  # GET request
             data = {
                 'sourceValue': request.args.get('sourceValue'),
@@ -213,75 +520,117 @@ def convert():
             }
         
         # Validate input
-        if not all(k in data and data[k] is not None for k in ['sourceValue', 'sourceUnit', 'targetUnit']):
-            return jsonify({
+        if not isinstance(data, dict) or not all(
+                k in data and data[k] is not None for k in ['sourceValue', 'sourceUnit', 'targetUnit']):
+            return fastjson({
                 'error': 'Missing required parameters. Please provide sourceValue, sourceUnit, and targetUnit'
-            }), 400
+            }, 400)
         
         source_value = data['sourceValue']
         source_unit = data['sourceUnit']
         target_unit = data['targetUnit']
         
+        error = validate_unit_symbols(source_unit, target_unit)
+        if error:
+            return fastjson({'error': error}, 400)
+        
         # Convert source value to float
         try:
             numeric_value = float(source_value)
-        except ValueError:
-            return jsonify({'error': 'Source value must be a valid number'}), 400
+        except (TypeError, ValueError):
+            return fastjson({'error': 'Source value must be a valid number'}, 400)
         
-        # Fetch dictionary
-        root = fetch_units_dictionary()
+        # Make sure the lookup tables reflect the current dictionary
+        load_units_index()
         
-        # Check if units are in the same quantity class
-        quantity_class = units_in_same_quantity_class(root, source_unit, target_unit)
-        if quantity_class is None:
-            return jsonify({
-                'error': 'Units are not compatible. They must belong to the same quantity class.'
-            }), 400
+        try:
+            target_value, base_value, base_unit, is_exact, quantity_class_name = _convert_cached(
+                numeric_value, source_unit, target_unit, dictionary_version
+            )
+        except ConversionError as e:
+            return fastjson({'error': str(e)}, 400)
         
-        # Get conversion parameters
-        source_params = get_conversion_parameters(root, source_unit)
-        target_params = get_conversion_parameters(root, target_unit)
+        # Return result
+        return fastjson({
+            'sourceValue': numeric_value,
+            'sourceUnit': source_unit,
+            'targetValue': target_value,
+            'targetUnit': target_unit,
+            'baseValue': base_value,
+            'baseUnit': base_unit,
+            'isExact': is_exact,
+            'quantityClass': quantity_class_name
+        })
+        
+    except Exception as e:
+        logger.error(f"Conversion error: {e}")
+        return fastjson({'error': 'Conversion failed. Please try again later.'}, 500)
+
+
+@app.route('/api/convert/bulk', methods=['POST'])
+def convert_bulk():
+    """
+    Bulk conversion endpoint
+    Converts a list of values between the same pair of units in one request
+    """
+    try:
+        data = orjson.loads(request.get_data())
+        
+        # Validate input
+        if not isinstance(data, dict) or not all(
+                k in data and data[k] is not None for k in ['sourceValues', 'sourceUnit', 'targetUnit']):
+            return fastjson({
+                'error': 'Missing required parameters. Please provide sourceValues, sourceUnit, and targetUnit'
+            }, 400)
         
-        if source_params is None or target_params is None:
-            return jsonify({'error': 'One or both units not found in dictionary'}), 400
+        source_values = data['sourceValues']
+        source_unit = data['sourceUnit']
+        target_unit = data['targetUnit']
+        
+        error = validate_unit_symbols(source_unit, target_unit)
+        if error:
+            return fastjson({'error': error}, 400)
         
-        # Convert to base unit
-        base_value = convert_to_base_unit(numeric_value, source_params)
+        if not isinstance(source_values, list):
+            return fastjson({'error': 'Source values must be a list of valid numbers'}, 400)
+        
+        # Convert source values to a float array
+        try:
+            numeric_values = np.asarray(source_values, dtype=np.float64)
+        except (ValueError, TypeError):
+            return fastjson({'error': 'Source values must be a list of valid numbers'}, 400)
         
-        # Convert from base unit to target unit
-        target_value = convert_from_base_unit(base_value, target_params)
+        if numeric_values.ndim != 1:
+            return fastjson({'error': 'Source values must be a list of valid numbers'}, 400)
         
-        # Determine if conversion is exact -true if one of the and clauses is true
-        is_exact = ((source_params["isBase"] and target_params.get("isExact", False)) or
-                   (target_params["isBase"] and source_params.get("isExact", False)) or
-                   (source_params.get("isExact", False) and target_params.get("isExact", False)))
+        # Make sure the lookup tables reflect the current dictionary
+        load_units_index()
         
-        # Get quantity class name and base unit
-        quantity_class_name = None
-        base_unit = None
+        try:
+            quantity_class, _, _, is_exact = _lookup_conversion(source_unit, target_unit)
+        except ConversionError as e:
+            return fastjson({'error': str(e)}, 400)
         
-        # Find the name element and baseForConversion element in the quantity class
-        for elem in quantity_class:
-            if elem.tag.endswith('name'):
-                quantity_class_name = elem.text
-            elif elem.tag.endswith('baseForConversion'):
-                base_unit = elem.text
+        if source_unit == target_unit:
+            target_values = numeric_values
+        else:
+            coefficients = _compose_cached(source_unit, target_unit, dictionary_version)
+            target_values = convert_array(numeric_values, coefficients)
         
         # Return result
-        return jsonify({
-            'sourceValue': numeric_value,
+        return fastjson({
+            'sourceValues': numeric_values.tolist(),
             'sourceUnit': source_unit,
-            'targetValue': target_value,
+            'targetValues': target_values.tolist(),
             'targetUnit': target_unit,
-            'baseValue': base_value,
-            'baseUnit': base_unit,
+            'baseUnit': quantity_class['base'],
             'isExact': is_exact,
-            'quantityClass': quantity_class_name
+            'quantityClass': quantity_class['name']
         })
         
     except Exception as e:
-        logger.error(f"Conversion error: {e}")
-        return jsonify({'error': 'Conversion failed. Please try again later.'}), 500
+        logger.error(f"Bulk conversion error: {e}")
+        return fastjson({'error': 'Conversion failed. Please try again later.'}, 500)
 
 
 @app.route('/api/units/<quantity_class_name>', methods=['GET'])
@@ -290,65 +639,29 @@ def get_units_for_class(quantity_class_name):
     Get all available units for a quantity class
     """
     try:
-        # Fetch dictionary
-        root = fetch_units_dictionary()
-        
-        # Determine namespace
-        namespace = ""
-        if "}" in root.tag:
-            namespace = root.tag.split("}")[0] + "}"
-        
-        # Find the quantityClassSet element first
-        quantity_class_set = None
-        for child in root:
-            if child.tag.endswith('quantityClassSet'):
-                quantity_class_set = child
-                break
-        
-        if quantity_class_set is None:
-            return jsonify({'error': 'Could not find quantity classes'}), 500
+        # Fetch dictionary lookup tables
+        _, classes = load_units_index()
         
-        # Find the specified quantity class
-        found = False
-        member_units = []
-        base_unit = None
+        if not classes:
+            return fastjson({'error': 'Could not find quantity classes'}, 500)
         
         # Match case-insensitively
-        for quantity_class in quantity_class_set:
-            if not quantity_class.tag.endswith('quantityClass'):
-                continue
-                
-            name_elem = None
-            for elem in quantity_class:
-                if elem.tag.endswith('name'):
-                    name_elem = elem
-                    break
-                    
-            if name_elem is not None and name_elem.text.lower() == quantity_class_name.lower():
-                found = True
-                
-                # Get all memberUnit elements
-                for elem in quantity_class:
-                    if elem.tag.endswith('memberUnit'):
-                        member_units.append(elem.text)
-                    elif elem.tag.endswith('baseForConversion'):
-                        base_unit = elem.text
-                break
+        quantity_class = CLASSES_CI.get(quantity_class_name.lower())
         
-        if not found:
+        if quantity_class is None:
             logger.warning(f"Quantity class '{quantity_class_name}' not found")
-            return jsonify({'error': 'Quantity class not found'}), 404
+            return fastjson({'error': 'Quantity class not found'}, 404)
         
         # Return all member units
-        return jsonify({
+        return fastjson({
             'quantityClass': quantity_class_name,
-            'baseUnit': base_unit,
-            'units': member_units
+            'baseUnit': quantity_class['base'],
+            'units': quantity_class['members_list']
         })
         
     except Exception as e:
         logger.error(f"Error fetching units: {e}")
-        return jsonify({'error': 'Failed to fetch units. Please try again later.'}), 500
+        return fastjson({'error': 'Failed to fetch units. Please try again later.'}, 500)
 
 
 @app.route('/api/quantityclasses', methods=['GET'])
@@ -357,57 +670,32 @@ def get_quantity_classes():
     Get all available quantity classes
     """
     try:
-        # Fetch dictionary
-        root = fetch_units_dictionary()
+        # Fetch dictionary lookup tables
+        _, classes = load_units_index()
         
         # Extract quantity class names
         class_data = []
-        
-        # Determine if there's a namespace
-        namespace = ""
-        if "}" in root.tag:
-            namespace = root.tag.split("}")[0] + "}"
-        
-        # Find the quantityClassSet element first (direct child of root)
-        quantity_class_set = None
-        for child in root:
-            if child.tag.endswith('quantityClassSet'):
-                quantity_class_set = child
-                break
-        
-        # If we found the quantityClassSet, look for quantityClass elements
-        if quantity_class_set is not None:
-            for quantity_class in quantity_class_set:
-                if quantity_class.tag.endswith('quantityClass'):
-                    # Get name element
-                    name_elem = None
-                    base_unit_elem = None
-                    
-                    for elem in quantity_class:
-                        if elem.tag.endswith('name'):
-                            name_elem = elem
-                        elif elem.tag.endswith('baseForConversion'):
-                            base_unit_elem = elem
-                    
-                    if name_elem is not None:
-                        class_info = {'name': name_elem.text}
-                        if base_unit_elem is not None:
-                            class_info['baseUnit'] = base_unit_elem.text
-                        class_data.append(class_info)
+        for quantity_class in classes.values():
+            class_info = {'name': quantity_class['name']}
+            if quantity_class['base'] is not None:
+                class_info['baseUnit'] = quantity_class['base']
+            class_data.append(class_info)
         
         logger.info(f"Returning {len(class_data)} quantity classes")
-        return jsonify(class_data)
+        return fastjson(class_data)
         
     except Exception as e:
         logger.error(f"Error fetching quantity classes: {e}")
-        return jsonify({'error': 'Failed to fetch quantity classes. Please try again later.'}), 500
+        return fastjson({'error': 'Failed to fetch quantity classes. Please try again later.'}, 500)
 
 @app.route('/api/health', methods=['GET'])
 def health_check():
     """
     Health check endpoint
     """
-    return jsonify({'status': 'healthy'})
+    return fastjson({'status': 'healthy'})
 
 if __name__ == '__main__':
-    app.run(debug=True, host='0.0.0.0', port=5000)
\ No newline at end of file
+    # Development server only; production runs under gunicorn (see gunicorn.conf.py)
+    start_background_refresh()
+    app.run(debug=bool(os.environ.get('FLASK_DEBUG')), host='0.0.0.0', port=5000)
\ No newline at end of file
@@ -0,0 +1,41 @@
+"""
+Gunicorn configuration for the Units Conversion API
+
+Run with:
+    gunicorn -c gunicorn.conf.py app:app
+
+The app is preloaded in the master so the units dictionary is downloaded and
+indexed once, then shared with every worker through copy-on-write fork.
+"""
+
+import multiprocessing
+import os
+
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:5000')
+workers = int(os.environ.get('GUNICORN_WORKERS', multiprocessing.cpu_count()))
+worker_class = 'gthread'
+threads = int(os.environ.get('GUNICORN_THREADS', 4))
+preload_app = True
+
+
+def on_starting(server):
+    """
+    Build the dictionary index in the master before any worker is forked
+    """
+    import app as units_app
+    try:
+        units_app.refresh_units_dictionary()
+    except Exception as e:
+        # Includes a download that hit HTTP_TIMEOUT; workers retry from their
+        # own refresh thread
+        server.log.error(f"Could not preload units dictionary: {e}")
+
+
+def post_fork(server, worker):
+    """
+    Threads do not survive fork, so each worker starts its own refresh thread
+    """
+    import app as units_app
+    # Don't share keep-alive sockets inherited from the master
+    units_app._SESSION.close()
+    units_app.start_background_refresh()
@@ -0,0 +1,137 @@
+"""
+Shared pytest fixtures for the Units Conversion API tests
+"""
+
+import hashlib
+import logging
+import os
+import sys
+import time
+
+import pytest
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from lxml import etree as ET
+
+# Add parent directory to path for importing from app module
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import app as app_module
+from app import app, UNITS_DICTIONARY_URL
+
+logger = logging.getLogger(__name__)
+
+# On-disk copies of downloaded dictionaries, keyed by URL
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache')
+CACHE_TTL = 24 * 60 * 60
+
+# Keep-alive session for every live HTTP call made by the tests
+_HTTP = requests.Session()
+_HTTP_ADAPTER = HTTPAdapter(pool_connections=4, pool_maxsize=16,
+                            max_retries=Retry(total=2, backoff_factor=0.1))
+_HTTP.mount('https://', _HTTP_ADAPTER)
+_HTTP.mount('http://', _HTTP_ADAPTER)
+
+# (connect, read) timeouts in seconds for live HTTP calls
+HTTP_TIMEOUT = (2, 5)
+
+def _load_dictionary_cached(url):
+    """
+    Return the body of url, reusing an on-disk copy younger than CACHE_TTL
+    Set USE_LIVE_DICTIONARY=1 to always download and refresh the copy
+    """
+    cache_path = os.path.join(CACHE_DIR, hashlib.sha1(url.encode('utf-8')).hexdigest() + '.xml')
+    live = os.environ.get('USE_LIVE_DICTIONARY') == '1'
+    if not live and os.path.exists(cache_path) and time.time() - os.path.getmtime(cache_path) < CACHE_TTL:
+        logger.info(f"Using cached dictionary {cache_path}")
+        with open(cache_path, 'rb') as f:
+            return f.read()
+
+    response = _HTTP.get(url, timeout=HTTP_TIMEOUT)
+    response.raise_for_status()
+
+    # Write to a temporary file first so a parallel run never reads a partial copy
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(response.content)
+    os.replace(tmp_path, cache_path)
+    return response.content
+
+def pytest_addoption(parser):
+    parser.addoption('--remote', action='store_true', default=False,
+                     help="run tests that need the live units dictionary")
+
+def pytest_configure(config):
+    config.addinivalue_line('markers', "remote: needs the live units dictionary (run with --remote)")
+
+def pytest_collection_modifyitems(config, items):
+    """Skip remote tests unless --remote was given"""
+    if config.getoption('--remote'):
+        return
+    skip_remote = pytest.mark.skip(reason="needs --remote")
+    for item in items:
+        if 'remote' in item.keywords:
+            item.add_marker(skip_remote)
+
+def pytest_sessionfinish(session, exitstatus):
+    """Close pooled connections once the run is over"""
+    _HTTP.close()
+
+@pytest.fixture(scope="session")
+def client():
+    """Flask test client shared by the whole test run"""
+    test_client = app.test_client()
+    test_client.testing = True
+    return test_client
+
+@pytest.fixture(scope="session")
+def units_dictionary():
+    """
+    The real units dictionary, loaded once per run and served by the in-process API
+    Tests using it are skipped when the dictionary cannot be fetched
+    """
+    try:
+        logger.info("Checking if units dictionary is available...")
+        dictionary = ET.fromstring(_load_dictionary_cached(UNITS_DICTIONARY_URL))
+    except Exception as e:
+        logger.error(f"Could not fetch the online dictionary: {e}")
+        pytest.skip("Units dictionary is not available")
+
+    app_module.units_dictionary = dictionary
+    yield dictionary
+    # Drop the dictionary handed to the API so other tests start clean
+    app_module.units_dictionary = None
+
+@pytest.fixture(scope="session")
+def quantity_classes_raw(client, units_dictionary):
+    """The /api/quantityclasses list, fetched once per run; None if the request failed"""
+    try:
+        response = client.get('/api/quantityclasses')
+        if response.status_code == 200:
+            return response.get_json()
+        logger.warning("Failed to fetch quantity classes from API")
+    except Exception as e:
+        logger.error(f"Error fetching quantity classes: {e}")
+    return None
+
+@pytest.fixture(scope="session")
+def quantity_classes(quantity_classes_raw):
+    """Common quantity classes and their base units, as reported by the API"""
+    if quantity_classes_raw is None:
+        return {}
+
+    # Extract common quantity classes with their base units
+    common_classes = {}
+
+    # Look for specific widely-used classes
+    target_classes = {'length', 'mass', 'pressure', 'temperature', 'time'}
+
+    for cls_info in quantity_classes_raw:
+        name = cls_info.get('name', '').lower()
+        if name in target_classes:
+            common_classes[name] = cls_info.get('baseUnit')
+
+    logger.info(f"Found test quantity classes: {common_classes}")
+    return common_classes
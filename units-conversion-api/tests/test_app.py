@@ -3,9 +3,10 @@ Unit tests for the Units Conversion API
 """
 
 import unittest
-import json
+import copy
 from unittest.mock import patch, MagicMock
-import xml.etree.ElementTree as ET
+from lxml import etree as ET
+import requests
 import sys
 import os
 
@@ -13,18 +14,44 @@ import os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 # Rest of your imports
-from app import app, fetch_units_dictionary, convert_to_base_unit, convert_from_base_unit
+from app import (app, fetch_units_dictionary, download_units_dictionary, refresh_units_dictionary,
+                 convert_to_base_unit, convert_from_base_unit, HTTP_TIMEOUT)
+
+# Conversion parameters from the mock dictionary
+PSI_PARAMS = {'isBase': False, 'A': 0, 'B': 4.4482216152605, 'C': 6.4516E-4, 'D': 0}
+MPA_PARAMS = {'isBase': False, 'A': 0, 'B': 1E6, 'C': 1, 'D': 0}
+
+# (value, params, expected, places, function) rows for the pure conversion helpers
+CONVERSION_CASES = [
+    # 50 psi is approximately 344737.9 Pa
+    (50, PSI_PARAMS, 344737.9, 1, convert_to_base_unit),
+    # 344737.9 Pa is approximately 0.345 MPa
+    (344737.9, MPA_PARAMS, 0.345, 3, convert_from_base_unit),
+    # and back again
+    (344737.9, PSI_PARAMS, 50.0, 3, convert_from_base_unit),
+    (0.345, MPA_PARAMS, 345000.0, 1, convert_to_base_unit),
+]
+
+class TestConversionFunctions(unittest.TestCase):
+    """Test cases for the pure conversion helpers; no client or mock dictionary needed"""
+
+    def test_conversion_table(self):
+        """Test convert_to_base_unit and convert_from_base_unit against known values"""
+        for value, params, expected, places, fn in CONVERSION_CASES:
+            with self.subTest(fn=fn.__name__, value=value, expected=expected):
+                self.assertAlmostEqual(fn(value, params), expected, places=places)
 
 class TestUnitsConversionAPI(unittest.TestCase):
     """Test cases for the Units Conversion API"""
 
-    def setUp(self):
-        """Set up test client and mock data"""
-        self.app = app.test_client()
-        self.app.testing = True
+    @classmethod
+    def setUpClass(cls):
+        """Set up the test client and parse the mock dictionary once for all tests"""
+        cls.app = app.test_client()
+        cls.app.testing = True
         
         # Create mock XML data for testing
-        self.mock_xml = """
+        cls.mock_xml = """
         <unitsDictionary>
             <quantityClass>
                 <name>pressure</name>
@@ -73,8 +100,17 @@ class TestUnitsConversionAPI(unittest.TestCase):
         </unitsDictionary>
         """
         
-        # Parse the mock XML
-        self.mock_root = ET.fromstring(self.mock_xml)
+        # Parse the mock XML; tests that modify the tree work on a copy
+        cls._BASE_ROOT = ET.fromstring(cls.mock_xml)
+        
+        # Quantity class that shares no units with pressure
+        cls._temperature_class_xml = ET.fromstring(
+            "<quantityClass><name>temperature</name><memberUnit>C</memberUnit></quantityClass>"
+        )
+
+    def setUp(self):
+        """Set up mock data"""
+        self.mock_root = self._BASE_ROOT
 
     @patch('app.fetch_units_dictionary')
     def test_convert_endpoint(self, mock_fetch):
@@ -96,7 +132,7 @@ class TestUnitsConversionAPI(unittest.TestCase):
         
         # Check response
         self.assertEqual(response.status_code, 200)
-        data = json.loads(response.data)
+        data = response.get_json()
         
         # We expect approximately 0.345 MPa for 50 psi
         self.assertAlmostEqual(data['targetValue'], 0.345, places=2)
@@ -105,15 +141,64 @@ class TestUnitsConversionAPI(unittest.TestCase):
         self.assertEqual(data['quantityClass'], 'pressure')
         
     @patch('app.fetch_units_dictionary')
-    def test_incompatible_units(self, mock_fetch):
-        """Test conversion with incompatible units"""
-        # Set up the mock
+    def test_convert_bulk_endpoint(self, mock_fetch):
+        """Test the /api/convert/bulk endpoint"""
+        # Set up the mock to return our test data
         mock_fetch.return_value = self.mock_root
         
-        # Add a new incompatible quantity class to our mock
-        temp_class = ET.SubElement(self.mock_root, 'quantityClass')
-        ET.SubElement(temp_class, 'name').text = 'temperature'
-        ET.SubElement(temp_class, 'memberUnit').text = 'C'
+        # Test data
+        test_data = {
+            'sourceValues': [50, '100', 0],
+            'sourceUnit': 'psi',
+            'targetUnit': 'MPa'
+        }
+        
+        # Make the request
+        response = self.app.post('/api/convert/bulk', 
+                                json=test_data,
+                                content_type='application/json')
+        
+        # Check response
+        self.assertEqual(response.status_code, 200)
+        data = response.get_json()
+        
+        # Bulk results should match the scalar conversion element by element
+        self.assertEqual(len(data['targetValues']), 3)
+        self.assertAlmostEqual(data['targetValues'][0], 0.345, places=2)
+        self.assertAlmostEqual(data['targetValues'][1], 0.689, places=2)
+        self.assertAlmostEqual(data['targetValues'][2], 0.0, places=6)
+        self.assertEqual(data['baseUnit'], 'Pa')
+        self.assertEqual(data['quantityClass'], 'pressure')
+        
+        # Non-numeric values are rejected
+        test_data['sourceValues'] = [1, 'abc']
+        response = self.app.post('/api/convert/bulk', 
+                                json=test_data,
+                                content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+
+    @patch('app.fetch_units_dictionary')
+    def test_identity_conversion(self, mock_fetch):
+        """Test converting a unit to itself returns the input unchanged"""
+        # Set up the mock to return our test data
+        mock_fetch.return_value = self.mock_root
+
+        response = self.app.get('/api/convert?sourceValue=0.1&sourceUnit=psi&targetUnit=psi')
+
+        # Check response
+        self.assertEqual(response.status_code, 200)
+        data = response.get_json()
+        self.assertEqual(data['targetValue'], 0.1)
+        self.assertEqual(data['baseUnit'], 'Pa')
+        self.assertEqual(data['quantityClass'], 'pressure')
+
+    @patch('app.fetch_units_dictionary')
+    def test_incompatible_units(self, mock_fetch):
+        """Test conversion with incompatible units"""
+        # Add a new incompatible quantity class to a private copy of our mock
+        root = copy.deepcopy(self._BASE_ROOT)
+        root.append(copy.deepcopy(self._temperature_class_xml))
+        mock_fetch.return_value = root
         
         # Test data with incompatible units
         test_data = {
@@ -129,49 +214,37 @@ class TestUnitsConversionAPI(unittest.TestCase):
         
         # Check response - should be a 400 error
         self.assertEqual(response.status_code, 400)
-        data = json.loads(response.data)
+        data = response.get_json()
         self.assertIn('error', data)
         self.assertIn('not compatible', data['error'])
-        
-    def test_convert_to_base_unit(self):
-        """Test the convert_to_base_unit function"""
-        # Test parameters for psi to Pa conversion
-        params = {
-            'isBase': False,
-            'A': 0,
-            'B': 4.4482216152605,
-            'C': 6.4516E-4,
-            'D': 0
-        }
-        
-        # Convert 50 psi to Pa
-        result = convert_to_base_unit(50, params)
-        
-        # Expected result: approximately 344737.9 Pa
-        self.assertAlmostEqual(result, 344737.9, places=1)
-        
-    def test_convert_from_base_unit(self):
-        """Test the convert_from_base_unit function"""
-        # Test parameters for Pa to MPa conversion
-        params = {
-            'isBase': False,
-            'A': 0,
-            'B': 1E6,
-            'C': 1,
-            'D': 0
-        }
-        
-        # Convert 344737.9 Pa to MPa
-        result = convert_from_base_unit(344737.9, params)
-        
-        # Expected result: approximately 0.345 MPa
-        self.assertAlmostEqual(result, 0.345, places=3)
-        
+
+    @patch('app.fetch_units_dictionary')
+    def test_invalid_units(self, mock_fetch):
+        """Test conversion with unknown or malformed unit symbols"""
+        # Set up the mock
+        mock_fetch.return_value = self.mock_root
+
+        # Unknown unit symbol
+        response = self.app.post('/api/convert',
+                                json={'sourceValue': 1, 'sourceUnit': 'psi', 'targetUnit': 'psj'},
+                                content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('not found', response.get_json()['error'])
+
+        # Malformed unit symbols are rejected before the dictionary is consulted
+        mock_fetch.reset_mock()
+        for target_unit in ['', 42, 'x' * 1000]:
+            response = self.app.post('/api/convert',
+                                    json={'sourceValue': 1, 'sourceUnit': 'psi', 'targetUnit': target_unit},
+                                    content_type='application/json')
+            self.assertEqual(response.status_code, 400)
+        mock_fetch.assert_not_called()
+
     def test_health_endpoint(self):
         """Test the health check endpoint"""
         response = self.app.get('/api/health')
         self.assertEqual(response.status_code, 200)
-        data = json.loads(response.data)
+        data = response.get_json()
         self.assertEqual(data['status'], 'healthy')
         
     @patch('app.fetch_units_dictionary')
@@ -185,13 +258,13 @@ class TestUnitsConversionAPI(unittest.TestCase):
         
         # Check response
         self.assertEqual(response.status_code, 200)
-        data = json.loads(response.data)
+        data = response.get_json()
         
         # We should have at least our pressure class
         self.assertGreaterEqual(len(data), 1)
         self.assertTrue(any(item['name'] == 'pressure' for item in data))
 
-    @patch('app.requests.get')
+    @patch('app._SESSION.get')
     def test_fetch_units_dictionary_exception(self, mock_get):
         """Test exception handling in fetch_units_dictionary"""
         # Make the request raise an exception
@@ -201,5 +274,23 @@ class TestUnitsConversionAPI(unittest.TestCase):
         with self.assertRaises(Exception):
             fetch_units_dictionary()
 
+    @patch('app._SESSION.get')
+    def test_fetch_units_dictionary_timeout(self, mock_get):
+        """Test that a stalled download times out and is reported as a failed fetch"""
+        mock_get.side_effect = requests.Timeout("read timed out")
+        
+        with self.assertRaisesRegex(Exception, "Failed to fetch"):
+            download_units_dictionary()
+        self.assertEqual(mock_get.call_args.kwargs['timeout'], HTTP_TIMEOUT)
+
+    @patch('app._SESSION.get')
+    def test_refresh_units_dictionary_timeout(self, mock_get):
+        """Test that a stalled streaming download (the gunicorn preload) fails instead of hanging"""
+        mock_get.side_effect = requests.Timeout("read timed out")
+        
+        with self.assertRaisesRegex(Exception, "Failed to fetch"):
+            refresh_units_dictionary()
+        self.assertEqual(mock_get.call_args.kwargs['timeout'], HTTP_TIMEOUT)
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
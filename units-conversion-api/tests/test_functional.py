@@ -1,13 +1,18 @@
 """
 Functional tests for the Units Conversion API using the real online dictionary
+
+The dictionary comes from the on-disk cache in conftest.py; set
+USE_LIVE_DICTIONARY=1 to download a fresh copy.
 """
 
 import unittest
-import json
 import sys
 import os
 import logging
+from itertools import islice
+import pytest
 import requests
+from lxml import etree as ET
 from typing import Dict, Any, List
 
 # Configure logging
@@ -19,8 +24,12 @@ logger = logging.getLogger(__name__)
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 # Import from your application
-from app import app, fetch_units_dictionary
+import app as app_module
+from app import app, UNITS_DICTIONARY_URL
+# Same on-disk dictionary cache as the conftest fixtures
+from conftest import _load_dictionary_cached
 
+@pytest.mark.remote
 class TestUnitsConversionAPIFunctional(unittest.TestCase):
     """Functional test cases for the Units Conversion API using real dictionary"""
 
@@ -33,7 +42,9 @@ class TestUnitsConversionAPIFunctional(unittest.TestCase):
         # Try to fetch the real dictionary once to validate connectivity
         try:
             logger.info("Attempting to fetch the real dictionary...")
-            cls.dictionary = fetch_units_dictionary()
+            cls.dictionary = ET.fromstring(_load_dictionary_cached(UNITS_DICTIONARY_URL))
+            # Serve the API from the same copy so its requests skip the network as well
+            app_module.units_dictionary = cls.dictionary
             cls.test_enabled = True
             logger.info("Successfully fetched the real dictionary")
             
@@ -41,24 +52,52 @@ class TestUnitsConversionAPIFunctional(unittest.TestCase):
             cls.available_quantity_classes = cls._extract_quantity_classes(cls.dictionary)
             logger.info(f"Found quantity classes: {cls.available_quantity_classes.keys()}")
             
+            # The conversion cases only depend on the dictionary, so build them once
+            cls._valid_cases = cls._build_valid_cases()
+            cls._convert_payloads = [
+                ({
+                    'sourceValue': case['sourceValue'],
+                    'sourceUnit': case['sourceUnit'],
+                    'targetUnit': case['targetUnit']
+                }, case)
+                for case in cls._valid_cases
+            ]
+            
         except Exception as e:
             logger.error(f"Could not fetch the online dictionary: {e}")
             cls.test_enabled = False
             cls.available_quantity_classes = {}
+            cls._valid_cases = []
+            cls._convert_payloads = []
+    
+    @classmethod
+    def tearDownClass(cls):
+        """Drop the cached copy handed to the API so other test modules start clean"""
+        app_module.units_dictionary = None
     
     @staticmethod
     def _extract_quantity_classes(dictionary):
         """Extract quantity classes and their units from the dictionary"""
         quantity_classes = {}
         
-        for qc in dictionary.findall('.//quantityClass'):
-            name = qc.find('name').text
-            base_unit = qc.find('baseForConversion').text if qc.find('baseForConversion') is not None else None
-            member_units = [mu.text for mu in qc.findall('memberUnit')]
+        # iter() walks the parsed tree in C rather than building a findall() result list
+        for qc in dictionary.iter('quantityClass'):
+            # One pass over the children instead of a find()/findall() per field
+            name = None
+            base_unit = None
+            member_units = []
+            for child in qc:
+                if child.tag == 'name':
+                    name = child.text
+                elif child.tag == 'baseForConversion':
+                    base_unit = child.text
+                elif child.tag == 'memberUnit':
+                    member_units.append(child.text)
             
             quantity_classes[name] = {
                 'base_unit': base_unit,
-                'member_units': member_units
+                'member_units': member_units,
+                'member_units_set': frozenset(member_units)
             }
             
         return quantity_classes
@@ -72,7 +111,7 @@ class TestUnitsConversionAPIFunctional(unittest.TestCase):
         """Test the health check endpoint"""
         response = self.app.get('/api/health')
         self.assertEqual(response.status_code, 200)
-        data = json.loads(response.data)
+        data = response.get_json()
         self.assertEqual(data['status'], 'healthy')
 
     def test_quantity_classes_endpoint(self):
@@ -80,7 +119,7 @@ class TestUnitsConversionAPIFunctional(unittest.TestCase):
         response = self.app.get('/api/quantityclasses')
         
         self.assertEqual(response.status_code, 200)
-        data = json.loads(response.data)
+        data = response.get_json()
         
         # Verify we got some quantity classes
         self.assertGreater(len(data), 0)
@@ -100,7 +139,8 @@ class TestUnitsConversionAPIFunctional(unittest.TestCase):
         
         logger.info(f"Found expected classes: {found_expected}")
 
-    def get_valid_conversion_test_cases(self):
+    @classmethod
+    def _build_valid_cases(cls):
         """Dynamically generate valid test cases based on available units"""
         test_cases = []
         
@@ -124,12 +164,12 @@ class TestUnitsConversionAPIFunctional(unittest.TestCase):
         }
         
         # Add only test cases for available quantity classes
-        for qc_name, qc_data in self.available_quantity_classes.items():
+        for qc_name, qc_data in cls.available_quantity_classes.items():
             if qc_name in class_specific_cases:
                 for case in class_specific_cases[qc_name]:
                     # Check if both source and target units are available
-                    if (case['source'] in qc_data['member_units'] and 
-                        case['target'] in qc_data['member_units']):
+                    if (case['source'] in qc_data['member_units_set'] and 
+                        case['target'] in qc_data['member_units_set']):
                         
                         test_cases.append({
                             'sourceValue': case['value'],
@@ -146,7 +186,7 @@ class TestUnitsConversionAPIFunctional(unittest.TestCase):
         if not test_cases:
             logger.warning("No predefined test cases matched available units, creating generic tests")
             
-            for qc_name, qc_data in self.available_quantity_classes.items():
+            for qc_name, qc_data in cls.available_quantity_classes.items():
                 if len(qc_data['member_units']) >= 2 and qc_data['base_unit']:
                     # Find two different units that aren't the base unit
                     avail_units = [u for u in qc_data['member_units'] if u != qc_data['base_unit']]
@@ -166,22 +206,18 @@ class TestUnitsConversionAPIFunctional(unittest.TestCase):
 
     def test_convert_common_units(self):
         """Test conversion of common units using real dictionary"""
-        test_cases = self.get_valid_conversion_test_cases()
-        
-        if not test_cases:
+        if not self._convert_payloads:
             self.skipTest("No suitable test cases found with available units")
         
-        for test_case in test_cases:
+        # Request bodies are prebuilt in setUpClass; the loop uses plain asserts,
+        # which pytest rewrites, instead of TestCase assertion methods
+        for payload, test_case in self._convert_payloads:
             with self.subTest(f"Converting {test_case['sourceValue']} {test_case['sourceUnit']} to {test_case['targetUnit']}"):
                 logger.info(f"Testing conversion: {test_case['sourceValue']} {test_case['sourceUnit']} to {test_case['targetUnit']}")
                 
                 response = self.app.post(
                     '/api/convert',
-                    json={
-                        'sourceValue': test_case['sourceValue'],
-                        'sourceUnit': test_case['sourceUnit'],
-                        'targetUnit': test_case['targetUnit']
-                    },
+                    json=payload,
                     content_type='application/json'
                 )
                 
@@ -189,15 +225,15 @@ class TestUnitsConversionAPIFunctional(unittest.TestCase):
                 if response.status_code != 200:
                     logger.error(f"Failed conversion response: {response.data}")
                 
-                self.assertEqual(response.status_code, 200, 
-                               f"Failed to convert {test_case['sourceUnit']} to {test_case['targetUnit']}")
+                assert response.status_code == 200, \
+                    f"Failed to convert {test_case['sourceUnit']} to {test_case['targetUnit']}"
                 
-                data = json.loads(response.data)
+                data = response.get_json()
                 logger.info(f"Conversion result: {data}")
                 
                 # Verify the proper units and quantity class in response
-                self.assertEqual(data['sourceUnit'], test_case['sourceUnit'])
-                self.assertEqual(data['targetUnit'], test_case['targetUnit'])
+                assert data['sourceUnit'] == test_case['sourceUnit']
+                assert data['targetUnit'] == test_case['targetUnit']
                 
                 # For dynamic test cases, we don't verify the result value
                 if 'dynamic' not in test_case:
@@ -206,20 +242,13 @@ class TestUnitsConversionAPIFunctional(unittest.TestCase):
                     actual_value = float(data['targetValue'])
                     expected_value = test_case['expected_approx']
                     
-                    self.assertAlmostEqual(
-                        actual_value, 
-                        expected_value,
-                        delta=tolerance,
-                        msg=f"Conversion result for {test_case['sourceUnit']} to {test_case['targetUnit']} is off: got {actual_value}, expected {expected_value} ± {tolerance}"
-                    )
+                    assert abs(actual_value - expected_value) <= tolerance, \
+                        f"Conversion result for {test_case['sourceUnit']} to {test_case['targetUnit']} is off: got {actual_value}, expected {expected_value} ± {tolerance}"
                 
                 # Sometimes the API might return a slightly different quantity class name
                 # (e.g., "pressure" vs "Pressure"), so we check with case insensitivity
                 if 'quantity_class' in test_case and 'quantityClass' in data:
-                    self.assertEqual(
-                        data['quantityClass'].lower(), 
-                        test_case['quantity_class'].lower()
-                    )
+                    assert data['quantityClass'].lower() == test_case['quantity_class'].lower()
 
     def test_incompatible_units(self):
         """Test conversion with incompatible units using real dictionary"""
@@ -228,8 +257,7 @@ class TestUnitsConversionAPIFunctional(unittest.TestCase):
             self.skipTest("Need at least two quantity classes for incompatible units test")
         
         # Get the first two quantity classes
-        qc_names = list(self.available_quantity_classes.keys())
-        qc1, qc2 = qc_names[0], qc_names[1]
+        qc1, qc2 = islice(self.available_quantity_classes, 2)
         
         # Get a unit from each class
         unit1 = self.available_quantity_classes[qc1]['member_units'][0]
@@ -255,7 +283,8 @@ class TestUnitsConversionAPIFunctional(unittest.TestCase):
         logger.info(f"Incompatible units response: {response.data}")
         
         # Check response - should be a 400 error or contain an error message
-        data = json.loads(response.data)
+        data = response.get_json(force=True, silent=True)
+        self.assertIsNotNone(data, f"Response is not JSON: {response.data}")
         
         if response.status_code == 400:
             self.assertIn('error', data)
@@ -273,7 +302,7 @@ class TestUnitsConversionAPIFunctional(unittest.TestCase):
         # Test with an invalid unit
         test_data = {
             'sourceValue': '50',
-            'sourceUnit': list(self.available_quantity_classes.values())[0]['member_units'][0],
+            'sourceUnit': next(iter(self.available_quantity_classes.values()))['member_units'][0],
             'targetUnit': 'nonexistentunit_xyz123'
         }
         
@@ -289,7 +318,8 @@ class TestUnitsConversionAPIFunctional(unittest.TestCase):
         logger.info(f"Invalid unit response: {response.data}")
         
         # Should return an error (400) or a 200 with error info
-        data = json.loads(response.data)
+        data = response.get_json(force=True, silent=True)
+        self.assertIsNotNone(data, f"Response is not JSON: {response.data}")
         
         if response.status_code != 200:
             self.assertIn('error', data)
@@ -307,7 +337,7 @@ class TestUnitsConversionAPIFunctional(unittest.TestCase):
             self.skipTest("No quantity classes available for testing")
             
         # Get a valid unit for testing
-        qc_name = list(self.available_quantity_classes.keys())[0]
+        qc_name = next(iter(self.available_quantity_classes))
         valid_unit = self.available_quantity_classes[qc_name]['member_units'][0]
         
         # Test with an invalid value
@@ -329,7 +359,8 @@ class TestUnitsConversionAPIFunctional(unittest.TestCase):
         logger.info(f"Invalid value response: {response.data}")
         
         # Should return an error or error indicator
-        data = json.loads(response.data)
+        data = response.get_json(force=True, silent=True)
+        self.assertIsNotNone(data, f"Response is not JSON: {response.data}")
         
         if response.status_code != 200:
             self.assertIn('error', data)
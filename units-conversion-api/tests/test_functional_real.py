@@ -1,383 +1,240 @@
 """
 Comprehensive Functional tests for the Units Conversion API
+
+Fixtures (client, units_dictionary, quantity_classes) live in conftest.py and
+are set up once per test run. Tests marked remote need the live units
+dictionary and only run with --remote.
 """
 
-import unittest
-import json
 import logging
-import requests
-import sys
 import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import orjson
+import pytest
+
+from app import app
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, 
                     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-# Add parent directory to path for importing from app module
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-
-# Import from your application
-from app import app, UNITS_DICTIONARY_URL
+def test_health_endpoint(client):
+    """Test the health check endpoint"""
+    response = client.get('/api/health')
+    assert response.status_code == 200
+    data = response.get_json()
+    assert data['status'] == 'healthy'
 
-class TestUnitsConversionAPIFunctional(unittest.TestCase):
-    """Functional test cases for the Units Conversion API"""
+@pytest.mark.remote
+def test_quantity_classes_endpoint(client, quantity_classes_raw):
+    """Test the quantity classes endpoint"""
+    data = quantity_classes_raw
+    # Query the endpoint again only if the shared fetch failed or a live run was asked for
+    if data is None or os.environ.get('USE_LIVE_DICTIONARY') == '1':
+        response = client.get('/api/quantityclasses')
+        assert response.status_code == 200
+        data = response.get_json()
+    
+    # Verify we got a list with some data
+    assert isinstance(data, list)
+    assert len(data) > 0, "Expected at least one quantity class"
+    
+    # Check structure of returned data
+    sample_class = data[0]
+    assert 'name' in sample_class, "Each quantity class should have a name"
+    
+    # Check for common quantity classes
+    class_names = [cls.get('name', '').lower() for cls in data]
+    common_classes = ['length', 'mass', 'pressure', 'time']
+    
+    missing = [c for c in common_classes if not any(c in n for n in class_names)]
+    assert not missing, f"Common quantity classes {missing} not found"
 
-    @classmethod
-    def setUpClass(cls):
-        """Set up test client and validate dictionary access once for all tests"""
-        cls.app = app.test_client()
-        cls.app.testing = True
-        cls.base_url = "http://localhost:5000"  # Update if your server is running elsewhere
-        
-        # Check if server is running
-        try:
-            response = requests.get(f"{cls.base_url}/api/health")
-            if response.status_code != 200:
-                logger.warning("API server doesn't appear to be running. Some tests may fail.")
-                cls.server_running = False
-            else:
-                cls.server_running = True
-        except requests.ConnectionError:
-            logger.warning("Cannot connect to API server. Please start the server before running tests.")
-            cls.server_running = False
-        
-        # Try to fetch the units dictionary to check availability
-        try:
-            logger.info("Checking if units dictionary is available...")
-            response = requests.get(UNITS_DICTIONARY_URL)
-            response.raise_for_status()
-            cls.dictionary_available = True
-            
-            # Find common quantity classes for testing
-            cls.test_quantity_classes = cls._get_common_quantity_classes()
-            
-        except Exception as e:
-            logger.error(f"Could not fetch the online dictionary: {e}")
-            cls.dictionary_available = False
-            cls.test_quantity_classes = []
+@pytest.mark.remote
+def test_units_for_class_endpoint(client, quantity_classes):
+    """Test getting units for a specific quantity class"""
+    # Skip if we couldn't identify test quantity classes
+    if not quantity_classes:
+        pytest.skip("No test quantity classes available")
     
-    @classmethod
-    def _get_common_quantity_classes(cls):
-        """Fetch quantity classes from the API to use in tests"""
-        try:
-            response = requests.get(f"{cls.base_url}/api/quantityclasses")
-            if response.status_code == 200:
-                classes = response.json()
-                # Extract common quantity classes with their base units
-                common_classes = {}
-                
-                # Look for specific widely-used classes
-                target_classes = ['length', 'mass', 'pressure', 'temperature', 'time']
-                
-                for cls_info in classes:
-                    for target in target_classes:
-                        if cls_info.get('name', '').lower() == target.lower():
-                            common_classes[target] = cls_info.get('baseUnit')
-                
-                logger.info(f"Found test quantity classes: {common_classes}")
-                return common_classes
-            else:
-                logger.warning("Failed to fetch quantity classes from API")
-                return {}
-        except Exception as e:
-            logger.error(f"Error fetching quantity classes: {e}")
-            return {}
+    # Test with 'length' class (or first available class)
+    test_class = next(iter(quantity_classes)) if quantity_classes else 'length'
     
-    def setUp(self):
-        """Check preconditions before each test"""
-        if not self.server_running:
-            self.skipTest("API server is not running")
-        if not self.dictionary_available:
-            self.skipTest("Units dictionary is not available")
+    response = client.get(f'/api/units/{test_class}')
+    assert response.status_code == 200
+    data = response.get_json()
     
-    def test_health_endpoint(self):
-        """Test the health check endpoint"""
-        response = self.app.get('/api/health')
-        self.assertEqual(response.status_code, 200)
-        data = json.loads(response.data)
-        self.assertEqual(data['status'], 'healthy')
+    # Verify structure of response
+    assert 'quantityClass' in data, "Response should include quantity class name"
+    assert 'baseUnit' in data, "Response should include base unit"
+    assert 'units' in data, "Response should include units list"
     
-    def test_quantity_classes_endpoint(self):
-        """Test the quantity classes endpoint"""
-        response = self.app.get('/api/quantityclasses')
-        self.assertEqual(response.status_code, 200)
-        data = json.loads(response.data)
-        
-        # Verify we got a list with some data
-        self.assertIsInstance(data, list)
-        self.assertGreater(len(data), 0, "Expected at least one quantity class")
-        
-        # Check structure of returned data
-        sample_class = data[0]
-        self.assertIn('name', sample_class, "Each quantity class should have a name")
-        
-        # Check for common quantity classes
-        class_names = [cls.get('name', '').lower() for cls in data]
-        common_classes = ['length', 'mass', 'pressure', 'time']
-        
-        for common_class in common_classes:
-            found = False
-            for class_name in class_names:
-                if common_class in class_name:
-                    found = True
-                    break
-            
-            self.assertTrue(found, f"Common quantity class '{common_class}' not found")
+    # Verify it's the class we requested
+    assert data['quantityClass'] == test_class
     
-    def test_units_for_class_endpoint(self):
-        """Test getting units for a specific quantity class"""
-        # Skip if we couldn't identify test quantity classes
-        if not self.test_quantity_classes:
-            self.skipTest("No test quantity classes available")
-        
-        # Test with 'length' class (or first available class)
-        test_class = next(iter(self.test_quantity_classes)) if self.test_quantity_classes else 'length'
-        
-        response = self.app.get(f'/api/units/{test_class}')
-        self.assertEqual(response.status_code, 200)
-        data = json.loads(response.data)
-        
-        # Verify structure of response
-        self.assertIn('quantityClass', data, "Response should include quantity class name")
-        self.assertIn('baseUnit', data, "Response should include base unit")
-        self.assertIn('units', data, "Response should include units list")
-        
-        # Verify it's the class we requested
-        self.assertEqual(data['quantityClass'], test_class)
-        
-        # Verify there are some units
-        self.assertGreater(len(data['units']), 0, "Expected at least one unit in the class")
-        
-        # Test with non-existent class
-        response = self.app.get('/api/units/non_existent_class')
-        self.assertEqual(response.status_code, 404)
+    # Verify there are some units
+    assert len(data['units']) > 0, "Expected at least one unit in the class"
     
-    def test_convert_endpoint_basic(self):
-        """Test the conversion endpoint with basic conversion"""
-        # Skip if we couldn't identify test quantity classes
-        if not self.test_quantity_classes:
-            self.skipTest("No test quantity classes available")
-        
-        # Test length conversion (assuming 'm' and 'ft' are valid units)
-        if 'length' in self.test_quantity_classes:
-            payload = {
-                'sourceValue': 1.0,
-                'sourceUnit': 'm',
-                'targetUnit': 'ft'  
-            }
-            
-            response = self.app.post('/api/convert', 
-                                    json=payload,
-                                    content_type='application/json')
-            
-            self.assertEqual(response.status_code, 200)
-            data = json.loads(response.data)
-            
-            # Verify response structure
-            self.assertIn('sourceValue', data)
-            self.assertIn('sourceUnit', data)
-            self.assertIn('targetValue', data)
-            self.assertIn('targetUnit', data)
-            self.assertIn('baseValue', data)
-            self.assertIn('baseUnit', data)
-            self.assertIn('quantityClass', data)
-            
-            # Verify values (approximately)
-            self.assertAlmostEqual(data['sourceValue'], 1.0)
-            # 1 meter is approximately 3.28084 feet
-            self.assertAlmostEqual(data['targetValue'], 3.28084, places=4)
-            
-            # Verify the right quantity class was detected
-            self.assertEqual(data['quantityClass'].lower(), 'length')
-        else:
-            logger.info("Skipping length conversion test as 'length' class not available")
+    # Test with non-existent class
+    response = client.get('/api/units/non_existent_class')
+    assert response.status_code == 404
+
+# (quantity class, source unit, target unit, source value, expected target value)
+CASES = [
+    # 1 meter is approximately 3.28084 feet
+    ("length", "m", "ft", 1.0, 3.28084),
+    # 10000 Pa is approximately 1.45038 psi
+    ("pressure", "Pa", "psi", 10000.0, 1.45038),
+    # 1 kg is approximately 2.20462 lb
+    ("mass", "kg", "lbm", 1.0, 2.20462),
+    # F = (C * 9/5) + 32 and back again: C = (F - 32) * 5/9
+    ("thermodynamic temperature", "degC", "degF", 20.0, 68.0),
+    ("thermodynamic temperature", "degF", "degC", 68.0, 20.0),
+]
+
+# Request bodies are serialized once at import instead of on every POST
+_CASE_PAYLOADS = {
+    case: orjson.dumps({'sourceValue': case[3], 'sourceUnit': case[1], 'targetUnit': case[2]})
+    for case in CASES
+}
+_MISSING_FIELDS_PAYLOAD = b'{"sourceValue":1.0}'
+_NOT_A_NUMBER_PAYLOAD = b'{"sourceValue":"not a number","sourceUnit":"m","targetUnit":"ft"}'
+_INCOMPATIBLE_PAYLOAD = b'{"sourceValue":1.0,"sourceUnit":"m","targetUnit":"kg"}'
+_FAKE_UNITS_PAYLOAD = b'{"sourceValue":1.0,"sourceUnit":"fake_unit_1","targetUnit":"fake_unit_2"}'
+
+# Reverse-direction rows, mapped to the forward row they may only skip along with
+_FORWARD_CASE = {CASES[4]: CASES[3]}
+
+# Classes whose name the conversion is expected to report, with how the reported
+# name is normalized first: length ignores case, temperature must match exactly
+CHECKED_CLASSES = {'length': str.lower, 'thermodynamic temperature': str}
+
+# Each pool thread posts through its own test client
+_thread_clients = threading.local()
+
+def _post_convert(payload):
+    """POST payload to /api/convert on this thread's test client"""
+    test_client = getattr(_thread_clients, 'client', None)
+    if test_client is None:
+        test_client = _thread_clients.client = app.test_client()
+    return test_client.post('/api/convert', data=payload, content_type='application/json')
+
+@pytest.fixture(scope="session")
+def convert_responses(units_dictionary):
+    """Responses for every CASES row, posted concurrently once per run"""
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        return dict(zip(CASES, pool.map(_post_convert, _CASE_PAYLOADS.values())))
+
+@pytest.mark.remote
+@pytest.mark.parametrize("qclass,src,tgt,sv,ev", CASES)
+def test_convert(convert_responses, quantity_classes, qclass, src, tgt, sv, ev):
+    """Test the conversion endpoint against known values"""
+    case = (qclass, src, tgt, sv, ev)
+    response = convert_responses[case]
     
-    def test_convert_endpoint_pressure(self):
-        """Test conversion with pressure units"""
-        # Test pressure conversion (assuming 'Pa' and 'psi' are valid units)
-        if 'pressure' in self.test_quantity_classes:
-            payload = {
-                'sourceValue': 10000.0,  # 10 kPa
-                'sourceUnit': 'Pa',
-                'targetUnit': 'psi'
-            }
-            
-            response = self.app.post('/api/convert', 
-                                    json=payload,
-                                    content_type='application/json')
-            
-            self.assertEqual(response.status_code, 200)
-            data = json.loads(response.data)
-            
-            # 10000 Pa is approximately 1.45038 psi
-            self.assertAlmostEqual(data['targetValue'], 1.45038, places=4)
-        else:
-            logger.info("Skipping pressure conversion test as 'pressure' class not available")
+    # Only classes the fixture found are required to convert; a reverse row must
+    # convert once its forward row has
+    if response.status_code == 400 and qclass not in quantity_classes:
+        forward = convert_responses[_FORWARD_CASE.get(case, case)]
+        if forward.status_code == 400:
+            data = response.get_json()
+            pytest.skip(f"{qclass} conversion test skipped: {data.get('error', 'Unknown error')}")
     
-    def test_convert_endpoint_mass(self):
-        """Test conversion with mass units"""
-        # Test mass conversion (assuming 'kg' and 'lbm' are valid units)
-        if 'mass' in self.test_quantity_classes:
-            payload = {
-                'sourceValue': 1.0,
-                'sourceUnit': 'kg',
-                'targetUnit': 'lbm'
-            }
-            
-            response = self.app.post('/api/convert', 
-                                    json=payload,
-                                    content_type='application/json')
-            
-            self.assertEqual(response.status_code, 200)
-            data = json.loads(response.data)
-            
-            # 1 kg is approximately 2.20462 lb
-            self.assertAlmostEqual(data['targetValue'], 2.20462, places=4)
-        else:
-            logger.info("Skipping mass conversion test as 'mass' class not available")
+    assert response.status_code == 200
+    data = response.get_json()
     
-    def test_convert_endpoint_invalid_request(self):
-        """Test conversion with invalid request payload"""
-        # Missing required fields
-        payload = {'sourceValue': 1.0}
-        response = self.app.post('/api/convert', 
-                                json=payload,
-                                content_type='application/json')
-        self.assertEqual(response.status_code, 400)
-        
-        # Invalid source value
-        payload = {
-            'sourceValue': 'not a number',
-            'sourceUnit': 'm',
-            'targetUnit': 'ft'
-        }
-        response = self.app.post('/api/convert', 
-                                json=payload,
-                                content_type='application/json')
-        self.assertEqual(response.status_code, 400)
-        
-        # Incompatible units
-        if 'length' in self.test_quantity_classes and 'mass' in self.test_quantity_classes:
-            payload = {
-                'sourceValue': 1.0,
-                'sourceUnit': 'm',  # length
-                'targetUnit': 'kg'  # mass
-            }
-            response = self.app.post('/api/convert', 
-                                    json=payload,
-                                    content_type='application/json')
-            self.assertEqual(response.status_code, 400)
-            data = json.loads(response.data)
-            self.assertIn('error', data)
-            self.assertIn('not compatible', data['error'])
+    # Verify response structure
+    for key in ('sourceValue', 'sourceUnit', 'targetValue', 'targetUnit',
+                'baseValue', 'baseUnit', 'quantityClass'):
+        assert key in data
+    
+    # Verify values (approximately)
+    assert data['sourceValue'] == pytest.approx(sv, abs=5e-8)
+    assert data['targetValue'] == pytest.approx(ev, abs=5e-5)
+    
+    # Verify the right quantity class was detected
+    if qclass in CHECKED_CLASSES:
+        assert CHECKED_CLASSES[qclass](data['quantityClass']) == qclass, \
+            f"Expected '{qclass}' but got {data['quantityClass']}"
 
-    def test_convert_endpoint_temperature(self):
-        """Test conversion with temperature units"""
-        # Test temperature conversion (Celsius to Fahrenheit)
-        # Simply try the conversion without checking for the quantity class first
-        
-        payload = {
-            'sourceValue': 20.0,  # 20°C
-            'sourceUnit': 'degC',
-            'targetUnit': 'degF'
-        }
-        
-        response = self.app.post('/api/convert', 
-                            json=payload,
+@pytest.mark.remote
+def test_convert_endpoint_invalid_request(client, quantity_classes):
+    """Test conversion with invalid request payload"""
+    # Missing required fields
+    response = client.post('/api/convert', 
+                            data=_MISSING_FIELDS_PAYLOAD,
                             content_type='application/json')
-        
-        # If the conversion fails with a 400 error, skip the test
-        if response.status_code == 400:
-            data = json.loads(response.data)
-            self.skipTest(f"Temperature conversion test skipped: {data.get('error', 'Unknown error')}")
-        
-        self.assertEqual(response.status_code, 200)
-        data = json.loads(response.data)
-        
-        # Verify conversion formula: F = (C * 9/5) + 32
-        # 20°C = 68°F
-        self.assertAlmostEqual(data['targetValue'], 68.0, places=4)
-        
-        # Verify the right quantity class was detected
-        self.assertEqual(data['quantityClass'], 'thermodynamic temperature', 
-                    f"Expected 'thermodynamic temperature' but got {data['quantityClass']}")
-        
-        # Test the reverse direction (Fahrenheit to Celsius)
-        reverse_payload = {
-            'sourceValue': 68.0,  # 68°F
-            'sourceUnit': 'degF',
-            'targetUnit': 'degC'
-        }
-        
-        reverse_response = self.app.post('/api/convert',
-                                    json=reverse_payload,
-                                    content_type='application/json')
-        
-        self.assertEqual(reverse_response.status_code, 200)
-        reverse_data = json.loads(reverse_response.data)
-        
-        # Verify reverse conversion: C = (F - 32) * 5/9
-        # 68°F = 20°C
-        self.assertAlmostEqual(reverse_data['targetValue'], 20.0, places=4)
+    assert response.status_code == 400
     
-    def test_convert_endpoint_non_existent_units(self):
-        """Test conversion with units that don't exist in the dictionary"""
-        payload = {
-            'sourceValue': 1.0,
-            'sourceUnit': 'fake_unit_1',
-            'targetUnit': 'fake_unit_2'
-        }
-        response = self.app.post('/api/convert', 
-                                json=payload,
+    # Invalid source value
+    response = client.post('/api/convert', 
+                            data=_NOT_A_NUMBER_PAYLOAD,
+                            content_type='application/json')
+    assert response.status_code == 400
+    
+    # Incompatible units
+    if 'length' in quantity_classes and 'mass' in quantity_classes:
+        # m is a length, kg a mass
+        response = client.post('/api/convert', 
+                                data=_INCOMPATIBLE_PAYLOAD,
                                 content_type='application/json')
-        self.assertEqual(response.status_code, 400)
-        data = json.loads(response.data)
-        self.assertIn('error', data)
-        # Instead of checking for specific text, just check that there's an error message
-        self.assertTrue(len(data['error']) > 0, "Expected a non-empty error message")
+        assert response.status_code == 400
+        data = response.get_json()
+        assert 'error' in data
+        assert 'not compatible' in data['error']
 
-    def test_bidirectional_conversion(self):
-        """Test conversions in both directions to verify consistency"""
-        # Skip if we couldn't identify test quantity classes
-        if not self.test_quantity_classes:
-            self.skipTest("No test quantity classes available")
-        
-        # Test length conversion both ways (m to ft and ft to m)
-        if 'length' in self.test_quantity_classes:
-            # Convert 1 m to ft
-            payload1 = {
-                'sourceValue': 1.0,
-                'sourceUnit': 'm',
-                'targetUnit': 'ft'
-            }
-            
-            response1 = self.app.post('/api/convert', 
-                                     json=payload1,
-                                     content_type='application/json')
-            
-            self.assertEqual(response1.status_code, 200)
-            data1 = json.loads(response1.data)
-            ft_value = data1['targetValue']
-            
-            # Convert the result back to m
-            payload2 = {
-                'sourceValue': ft_value,
-                'sourceUnit': 'ft',
-                'targetUnit': 'm'
-            }
-            
-            response2 = self.app.post('/api/convert', 
-                                     json=payload2,
-                                     content_type='application/json')
-            
-            self.assertEqual(response2.status_code, 200)
-            data2 = json.loads(response2.data)
-            
-            # Should get back to approximately 1.0 m
-            self.assertAlmostEqual(data2['targetValue'], 1.0, places=9)
-        else:
-            logger.info("Skipping bidirectional test as 'length' class not available")
+@pytest.mark.remote
+def test_convert_endpoint_non_existent_units(client, units_dictionary):
+    """Test conversion with units that don't exist in the dictionary"""
+    response = client.post('/api/convert', 
+                            data=_FAKE_UNITS_PAYLOAD,
+                            content_type='application/json')
+    assert response.status_code == 400
+    data = response.get_json()
+    assert 'error' in data
+    # Instead of checking for specific text, just check that there's an error message
+    assert len(data['error']) > 0, "Expected a non-empty error message"
+
+@pytest.mark.remote
+def test_bidirectional_conversion(client, quantity_classes):
+    """Test conversions in both directions to verify consistency"""
+    # Skip if we couldn't identify test quantity classes
+    if not quantity_classes:
+        pytest.skip("No test quantity classes available")
+    
+    # Test length conversion both ways (m to ft and ft to m)
+    if 'length' in quantity_classes:
+        # Convert 1 m to ft
+        response1 = client.post('/api/convert', 
+                                 data=_CASE_PAYLOADS[CASES[0]],
+                                 content_type='application/json')
+        
+        assert response1.status_code == 200
+        data1 = response1.get_json()
+        ft_value = data1['targetValue']
+        
+        # Convert the result back to m
+        payload2 = orjson.dumps({
+            'sourceValue': ft_value,
+            'sourceUnit': 'ft',
+            'targetUnit': 'm'
+        })
+        
+        response2 = client.post('/api/convert', 
+                                 data=payload2,
+                                 content_type='application/json')
+        
+        assert response2.status_code == 200
+        data2 = response2.get_json()
+        
+        # Should get back to approximately 1.0 m
+        assert data2['targetValue'] == pytest.approx(1.0, abs=5e-10)
+    else:
+        logger.info("Skipping bidirectional test as 'length' class not available")
 
 if __name__ == '__main__':
-    unittest.main()
\ No newline at end of file
+    sys.exit(pytest.main([__file__]))
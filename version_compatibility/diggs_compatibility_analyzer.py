@@ -10,38 +10,308 @@ Version: 1.0.0
 import os
 import sys
 import argparse
-import re
 from pathlib import Path
-from typing import Dict, List, Tuple, Set, Optional
+from typing import Dict, List, Tuple, Set, Optional, NamedTuple
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache
+from itertools import islice, zip_longest
+from xml.parsers import expat
 
 from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.styles import Font, PatternFill, Alignment
 
 # Import the schema resolver utilities
 from fixed_resolver import (
-    parse_schema, get_all_types, get_all_attributes, get_all_simpletypes,
-    resolve_content_model, get_base_type_name,
-    NS_26, NS_3
+    parse_schema, resolve_content_model, get_base_type_name, clean_type_name,
+    Elem, NS_26, NS_3
 )
 
+# Bare names of the XML Schema built-in types recognised by is_builtin_type
+_BUILTINS = frozenset([
+    'string', 'double', 'float', 'integer', 'int', 'long', 'short',
+    'byte', 'boolean', 'decimal', 'date', 'dateTime', 'time',
+    'anyURI', 'QName', 'anyType', 'anySimpleType'
+])
+
+# Below this many types the comparison runs in-process even when --jobs > 1
+PARALLEL_MIN_TYPES = 500
+
+# Analyzer used by ProcessPoolExecutor workers, set once per worker by _init_worker
+_worker_analyzer = None
+
+
+def _init_worker(analyzer):
+    """Keep the loaded analyzer in the worker process"""
+    global _worker_analyzer
+    _worker_analyzer = analyzer
+
+
+def _compare_types_chunk(chunk: List[Tuple[str, Optional[str]]]) -> List['TypeCompareResult']:
+    """Run compare_type over a shard of (qualified_name, mapped_name) pairs"""
+    return [_worker_analyzer.compare_type(name, mapped) for name, mapped in chunk]
+
+
+def _compare_simpletypes_chunk(chunk: List[Tuple[str, Optional[str]]]) -> List['SimpleTypeCompareResult']:
+    """Run compare_simpletype over a shard of (qualified_name, mapped_name) pairs"""
+    return [_worker_analyzer.compare_simpletype(name, mapped) for name, mapped in chunk]
+
+
+def _shards(items: List, count: int) -> List[List]:
+    """Split items into at most count contiguous lists"""
+    size = max(1, -(-len(items) // count))
+    it = iter(items)
+    return list(iter(lambda: list(islice(it, size)), []))
+
+
+# Report styles, shared by every cell that uses them; colors are ARGB with an opaque alpha
+HEADER_FONT = Font(bold=True, color='FFFFFFFF')
+HEADER_FILL = PatternFill(start_color='FF366092', end_color='FF366092', fill_type='solid')
+TITLE_FONT = Font(bold=True, size=14)
+BOLD_FONT = Font(bold=True)
+WRAP_ALIGN = Alignment(wrap_text=True, vertical='top')
+RED_FILL = PatternFill(start_color='FFFFC7CE', end_color='FFFFC7CE', fill_type='solid')
+GREEN_FILL = PatternFill(start_color='FFC6EFCE', end_color='FFC6EFCE', fill_type='solid')
+
+
+def _styled_cells(ws, values: List, font: Optional[Font] = None,
+                  fill: Optional[PatternFill] = None,
+                  alignment: Optional[Alignment] = WRAP_ALIGN) -> List:
+    """Styled cells for one row appended to a write-only sheet; None values stay empty"""
+    cells = []
+    for value in values:
+        if value is None:
+            cells.append(None)
+            continue
+        cell = WriteOnlyCell(ws, value=value)
+        if font is not None:
+            cell.font = font
+        if fill is not None:
+            cell.fill = fill
+        if alignment is not None:
+            cell.alignment = alignment
+        cells.append(cell)
+    return cells
+
+
+def _mapped_names(names: Set[str], mapping_names) -> Set[str]:
+    """Names in names that mapping entries refer to
+    
+    A mapping entry may be qualified ("eml:X") or bare ("X"); entries not found as
+    given are matched on the bare type name, taking the first qualified name in order.
+    """
+    by_bare = {}
+    for qualified_name in sorted(names):
+        by_bare.setdefault(qualified_name.rpartition(':')[2], qualified_name)
+    
+    mapped = set()
+    for name in mapping_names:
+        if name in names:
+            mapped.add(name)
+        else:
+            qualified_name = by_bare.get(name.rpartition(':')[2])
+            if qualified_name is not None:
+                mapped.add(qualified_name)
+    return mapped
+
+
+def _enumeration_summary(enums: List[str]) -> Optional[str]:
+    """Up to 20 enumerations, one per line, with a count of the rest"""
+    if not enums:
+        return None
+    summary = '\n'.join(enums[:20])  # Show up to 20
+    if len(enums) > 20:
+        summary += f'\n... (+{len(enums)-20} more)'
+    return summary
+
+
+def _elements_equal(a, b) -> bool:
+    """Structurally compare two elements, stopping at the first difference
+    
+    Tags, attributes, stripped text and children (pairwise, in order) must match.
+    """
+    if a.tag != b.tag or a.attrib != b.attrib or len(a) != len(b):
+        return False
+    if (a.text or '').strip() != (b.text or '').strip():
+        return False
+    return all(_elements_equal(child_a, child_b) for child_a, child_b in zip(a, b))
+
+
+# Clark-notation tags matched while collecting named definitions in load_schemas
+_XS_COMPLEX_TYPE = '{http://www.w3.org/2001/XMLSchema}complexType'
+_XS_SIMPLE_TYPE = '{http://www.w3.org/2001/XMLSchema}simpleType'
+_XS_ATTRIBUTE = '{http://www.w3.org/2001/XMLSchema}attribute'
+_XS_DOCUMENTATION = '{http://www.w3.org/2001/XMLSchema}documentation'
+
+
+def _strip_documentation(definition) -> None:
+    """Drop xs:documentation children from a definition in place
+    
+    No comparison reads the prose, and it is most of the text a retained definition holds.
+    xs:appinfo is kept: the descendant searches for bases and facets can reach into it.
+    """
+    for node in definition.iter():
+        for child in [c for c in node if c.tag == _XS_DOCUMENTATION]:
+            node.remove(child)
+
+# (targetNamespace substring, label function) pairs tried in order by _extract_namespace_label
+_NS_LABEL_RULES = [
+    ('diggsml.org/schemas', lambda ns: 'diggs_geo' if 'geotechnical' in ns else 'diggs'),
+    ('energistics.org/energyml/data/commonv2', lambda ns: 'eml'),
+    ('energistics.org/energyml/data/witsmlv2', lambda ns: 'witsml'),
+    ('opengis.net/gml', lambda ns: 'glrov' if '/lrov' in ns else 'glr' if '/lr' in ns else 'gml'),
+]
+
+
+# Numeric stand-in for maxOccurs="unbounded"
+_UNBOUNDED = 999999
+
+
+def _occurs_range(elem: Elem) -> Tuple[int, int]:
+    """Numeric (min, max) for an element's minOccurs/maxOccurs strings"""
+    min_occurs = elem.minOccurs
+    max_occurs = elem.maxOccurs
+    min_val = int(min_occurs) if min_occurs.isdigit() else 0
+    if max_occurs == 'unbounded':
+        max_val = _UNBOUNDED
+    else:
+        max_val = int(max_occurs) if max_occurs.isdigit() else 1
+    return min_val, max_val
+
+
+def _diff_sorted(old_names: List[str], new_names: List[str]) -> Tuple[List[str], List[str], List[str]]:
+    """Split two sorted name lists into (added, removed, common) in one merge pass
+    
+    Each returned list is sorted.
+    """
+    added, removed, common = [], [], []
+    i = j = 0
+    while i < len(old_names) and j < len(new_names):
+        old_name, new_name = old_names[i], new_names[j]
+        if old_name == new_name:
+            common.append(old_name)
+            i += 1
+            j += 1
+        elif old_name < new_name:
+            removed.append(old_name)
+            i += 1
+        else:
+            added.append(new_name)
+            j += 1
+    removed.extend(old_names[i:])
+    added.extend(new_names[j:])
+    return added, removed, common
+
+
+class _ContentModel(NamedTuple):
+    """A resolved content model plus lookups derived from it once"""
+    elements: Dict
+    attrs: Dict
+    names: frozenset
+    attr_names: frozenset
+    sorted_names: List[str]
+    sorted_attr_names: List[str]
+    occurs: Dict[str, Tuple[int, int]]
+    required_names: frozenset
+    required_attr_names: frozenset
+
+
+class TypeCompareResult:
+    """Comparison of one complexType between the old and new versions"""
+    __slots__ = ('name', 'type_removed', 'base_changed', 'structure_changes',
+                 'new_elements', 'missing_elements', 'expanded_cardinality',
+                 'restricted_cardinality', 'type_changes', 'notes', 'compatible')
+    
+    def __init__(self, name: str):
+        self.name = name  # Includes namespace prefix
+        self.type_removed = ''
+        self.base_changed = ''
+        self.structure_changes = ''
+        self.new_elements: List[str] = []
+        self.missing_elements: List[str] = []
+        self.expanded_cardinality: List[str] = []
+        self.restricted_cardinality: List[str] = []
+        self.type_changes: List[str] = []
+        self.notes = ''
+        self.compatible = 'Yes'
+
+
+class SimpleTypeCompareResult:
+    """Comparison of one simpleType between the old and new versions"""
+    __slots__ = ('name', 'type_removed', 'base_changed', 'enumerations_removed',
+                 'enumerations_added', 'pattern_changed', 'notes', 'compatible')
+    
+    def __init__(self, name: str):
+        self.name = name  # Includes namespace prefix
+        self.type_removed = ''
+        self.base_changed = ''
+        self.enumerations_removed: List[str] = []
+        self.enumerations_added: List[str] = []
+        self.pattern_changed = ''
+        self.notes = ''
+        self.compatible = 'Yes'
+
+
+class _SchemaHeaderFound(Exception):
+    """Raised from the expat handler to stop parsing after the root element"""
+
+
+def _read_schema_header(xsd_file: Path) -> Tuple[Optional[str], Optional[str]]:
+    """Read version and targetNamespace from the root schema element
+    
+    Parsing stops at the first start tag, so only the file header is read.
+    """
+    header = [None, None]
+    
+    def start_element(name, attrs):
+        if name.rsplit(':', 1)[-1] == 'schema':
+            header[0] = attrs.get('version')
+            header[1] = attrs.get('targetNamespace')
+        raise _SchemaHeaderFound
+    
+    parser = expat.ParserCreate()
+    parser.StartElementHandler = start_element
+    with open(xsd_file, 'rb') as f:
+        try:
+            while True:
+                chunk = f.read(4096)
+                parser.Parse(chunk, not chunk)
+                if not chunk:
+                    break
+        except _SchemaHeaderFound:
+            pass
+    
+    return header[0], header[1]
+
 
 class DIGGSCompatibilityAnalyzer:
     """Main analyzer class for DIGGS schema compatibility checking"""
     
-    def __init__(self, old_dir: str, new_dir: str, mapping_file: Optional[str] = None):
+    def __init__(self, old_dir: str, new_dir: str, mapping_file: Optional[str] = None,
+                 jobs: int = 1):
         self.old_dir = Path(old_dir)
         self.new_dir = Path(new_dir)
         self.mapping_file = Path(mapping_file) if mapping_file else None
+        # Worker processes for the comparison phase; 0 means one per CPU
+        self.jobs = jobs if jobs > 0 else (os.cpu_count() or 1)
         
         self.old_version = None
         self.new_version = None
         self.type_mappings = {}
+        # Mappings whose old name has no namespace prefix, matched on bare type names
+        self._bare_to_mapping = {}
+        # Mapping targets already normalized for the content model check
+        self._normalized_mappings = {}
         self.type_compat_cache = {}
+        self._schema_headers = {}
+        # Resolved content models per type name; cleared by analyze()
+        self._cm_old_cache = {}
+        self._cm_new_cache = {}
         
         # Schema collections
-        self.old_schemas = []
-        self.new_schemas = []
+        # Parsed schema roots are not kept; ElementTree nodes hold no parent
+        # link, so only the collected definitions below stay in memory
         self.old_types = {}
         self.old_attrs = {}
         self.old_simpletypes = {}
@@ -51,34 +321,34 @@ class DIGGSCompatibilityAnalyzer:
         
     def detect_version(self, directory: Path) -> str:
         """Detect DIGGS version from schema files in directory"""
+        return self._select_version(directory, self._scan_schema_tree(directory)[1])
+    
+    def _scan_schema_tree(self, directory: Path) -> Tuple[List[Path], Set[str]]:
+        """Walk directory once, returning its sorted .xsd files and the DIGGS versions they declare
+        
+        Headers read here are kept for _extract_namespace_label, so load_schemas
+        can take the file list and skip a second walk.
+        """
+        schema_files = self.find_schema_files(directory)
         versions = set()
         
-        for xsd_file in directory.rglob('*.xsd'):
+        for xsd_file in schema_files:
             try:
-                with open(xsd_file, 'r', encoding='utf-8') as f:
-                    content = f.read(5000)  # Read first 5KB to ensure we get schema element
-                    
-                    # Find schema element(s)
-                    schema_pattern = re.compile(r'<schema[^>]*>', re.IGNORECASE | re.DOTALL)
-                    matches = schema_pattern.finditer(content)
-                    
-                    for match in matches:
-                        schema_tag = match.group(0)
-                        
-                        # Only process schemas with diggsml.org in targetNamespace
-                        if 'diggsml.org' in schema_tag:
-                            # Extract version from this schema element
-                            version_match = re.search(r'version\s*=\s*["\']([^"\']+)["\']', schema_tag)
-                            if version_match:
-                                version = version_match.group(1)
-                                # Skip XML declaration versions (1.0, 1.1)
-                                if version not in ['1.0', '1.1']:
-                                    versions.add(version)
-                                    break  # Found DIGGS version in this file
-                                    
+                version, target_ns = self._schema_header(xsd_file)
             except Exception as e:
                 print(f"Warning: Could not read {xsd_file}: {e}")
+                continue
+            
+            # Only process schemas with diggsml.org in targetNamespace
+            if target_ns and 'diggsml.org' in target_ns and version:
+                # Skip XML declaration versions (1.0, 1.1)
+                if version not in ['1.0', '1.1']:
+                    versions.add(version)
         
+        return schema_files, versions
+    
+    def _select_version(self, directory: Path, versions: Set[str]) -> str:
+        """Pick the DIGGS version to report from the versions found in directory"""
         if len(versions) == 0:
             raise ValueError(f"No DIGGS schema version found in {directory}. "
                            f"Make sure directory contains .xsd files with targetNamespace='...diggsml.org...'")
@@ -88,6 +358,13 @@ class DIGGSCompatibilityAnalyzer:
         
         return sorted(versions)[0]
     
+    def _schema_header(self, xsd_file: Path) -> Tuple[Optional[str], Optional[str]]:
+        """Return (version, targetNamespace) of a schema file, reading each file once"""
+        header = self._schema_headers.get(xsd_file)
+        if header is None:
+            header = self._schema_headers[xsd_file] = _read_schema_header(xsd_file)
+        return header
+    
     def load_mappings(self) -> Dict[str, str]:
         """Load type mappings from tab-separated file"""
         mappings = {}
@@ -106,8 +383,8 @@ class DIGGSCompatibilityAnalyzer:
                     
                     parts = line.split('\t')
                     if len(parts) >= 2:
-                        old_type = parts[0].strip()
-                        new_type = parts[1].strip()
+                        old_type = sys.intern(parts[0].strip())
+                        new_type = sys.intern(parts[1].strip())
                         if old_type and new_type:
                             mappings[old_type] = new_type
                     else:
@@ -125,27 +402,40 @@ class DIGGSCompatibilityAnalyzer:
         """Recursively find all .xsd files in directory"""
         return sorted(directory.rglob('*.xsd'))
     
-    def load_schemas(self, directory: Path, namespace_dict: dict) -> Tuple[List, Dict, Dict, Dict]:
-        """Load all schemas from directory"""
+    def load_schemas(self, directory: Path, namespace_dict: dict,
+                     schema_files: Optional[List[Path]] = None) -> Tuple[List, Dict, Dict, Dict]:
+        """Load all schemas from directory
+        
+        Args:
+            directory: Root of the schema tree
+            namespace_dict: Namespace prefixes for the schema version
+            schema_files: Sorted .xsd files already found under directory, if any
+        """
         print(f"\nLoading schemas from: {directory}")
         
-        schema_files = self.find_schema_files(directory)
+        if schema_files is None:
+            schema_files = self.find_schema_files(directory)
         if not schema_files:
             raise ValueError(f"No .xsd files found in {directory}")
         
+        def read_schema(xsd_file):
+            # Extract namespace from schema's targetNamespace attribute, then parse
+            return self._extract_namespace_label(xsd_file), parse_schema(str(xsd_file), namespace_dict)
+        
+        # Files are read and parsed concurrently; map() keeps them in sorted order
+        with ThreadPoolExecutor(max_workers=min(32, len(schema_files))) as pool:
+            loaded = list(pool.map(read_schema, schema_files))
+        
         # Track schemas with their namespace labels
         schemas_with_ns = []
         
-        for xsd_file in schema_files:
-            # Extract namespace from schema's targetNamespace attribute
+        for xsd_file, (ns_label, schema) in zip(schema_files, loaded):
             relative_path = xsd_file.relative_to(directory)
-            ns_label = self._extract_namespace_label(xsd_file)
             
             if not ns_label or ns_label == 'unknown':
                 print(f"  ⚠ Warning: Could not extract namespace from {relative_path}, defaulting to 'diggs'")
                 ns_label = 'diggs'
             
-            schema = parse_schema(str(xsd_file), namespace_dict)
             if schema is not None:
                 schemas_with_ns.append((schema, ns_label))
                 print(f"  ✓ {relative_path} ({ns_label})")
@@ -153,6 +443,8 @@ class DIGGSCompatibilityAnalyzer:
         # Collect types with qualified names
         all_types = {}
         all_simpletypes = {}
+        # Attributes don't need namespace qualification (they're referenced differently)
+        all_attrs = {}
         
         for schema, ns_label in schemas_with_ns:
             # Ensure we have a valid namespace label
@@ -160,24 +452,30 @@ class DIGGSCompatibilityAnalyzer:
                 # Default to 'diggs' if namespace extraction failed
                 ns_label = 'diggs'
             
-            # Collect complexTypes with namespace prefix
-            for ct in schema.findall('.//xs:complexType', namespace_dict):
-                name = ct.get('name')
-                if name:
-                    # Use qualified name as key
-                    qualified_name = f"{ns_label}:{name}"
-                    all_types[qualified_name] = ct
-            
-            # Collect simpleTypes with namespace prefix
-            for st in schema.findall('.//xs:simpleType', namespace_dict):
-                name = st.get('name')
+            # Collect complexTypes, simpleTypes and attributes in one walk
+            for elem in schema.iter():
+                tag = elem.tag
+                if tag == _XS_ATTRIBUTE:
+                    name = elem.get('name')
+                    if name:
+                        all_attrs[name] = elem
+                    continue
+                if tag == _XS_COMPLEX_TYPE:
+                    collected = all_types
+                elif tag == _XS_SIMPLE_TYPE:
+                    collected = all_simpletypes
+                else:
+                    continue
+                
+                name = elem.get('name')
                 if name:
-                    qualified_name = f"{ns_label}:{name}"
-                    all_simpletypes[qualified_name] = st
+                    # Use qualified name as key; interned as it recurs across caches and mappings
+                    collected[sys.intern(f"{ns_label}:{name}")] = elem
         
-        # Attributes don't need namespace qualification (they're referenced differently)
-        schemas_only = [s for s, ns in schemas_with_ns]
-        all_attrs = get_all_attributes(schemas_only, namespace_dict)
+        # Only these definitions outlive the parsed trees; keep them lean
+        for collected in (all_types, all_simpletypes, all_attrs):
+            for definition in collected.values():
+                _strip_documentation(definition)
         
         print(f"  Total: {len(all_types)} complexTypes, {len(all_simpletypes)} simpleTypes, {len(all_attrs)} attributes")
         
@@ -186,54 +484,39 @@ class DIGGSCompatibilityAnalyzer:
     def _extract_namespace_label(self, xsd_file: Path) -> str:
         """Extract namespace label from schema's targetNamespace attribute"""
         try:
-            with open(xsd_file, 'r', encoding='utf-8') as f:
-                content = f.read(3000)  # Read first 3KB to get schema element
-                
-                # Find targetNamespace attribute
-                match = re.search(r'targetNamespace\s*=\s*["\']([^"\']+)["\']', content)
-                if not match:
-                    return 'unknown'
-                
-                target_ns = match.group(1)
-                
-                # Map targetNamespace to namespace label
-                if 'diggsml.org/schemas' in target_ns:
-                    if 'geotechnical' in target_ns:
-                        return 'diggs_geo'
-                    else:
-                        return 'diggs'
-                elif 'energistics.org/energyml/data/commonv2' in target_ns:
-                    return 'eml'
-                elif 'energistics.org/energyml/data/witsmlv2' in target_ns:
-                    return 'witsml'
-                elif 'opengis.net/gml' in target_ns:
-                    if '/lrov' in target_ns:
-                        return 'glrov'
-                    elif '/lr' in target_ns:
-                        return 'glr'
-                    else:
-                        return 'gml'
-                else:
-                    # For unknown namespaces, try to extract a reasonable label
-                    # from the last part of the namespace
-                    parts = target_ns.rstrip('/').split('/')
-                    return parts[-1] if parts else 'unknown'
-                    
+            # Find targetNamespace attribute
+            target_ns = self._schema_header(xsd_file)[1]
+            if not target_ns:
+                return 'unknown'
+            
+            # Map targetNamespace to namespace label
+            for marker, label in _NS_LABEL_RULES:
+                if marker in target_ns:
+                    return label(target_ns)
+            
+            # For unknown namespaces, try to extract a reasonable label
+            # from the last part of the namespace
+            parts = target_ns.rstrip('/').split('/')
+            return parts[-1] if parts else 'unknown'
+            
         except Exception as e:
             print(f"Warning: Could not extract namespace from {xsd_file}: {e}")
             return 'unknown'
     
-    def normalize_type_name(self, type_name: str) -> str:
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def normalize_type_name(type_name: str) -> str:
         """Normalize type names - preserves namespace prefixes
         
         Uses clean_type_name from fixed_resolver to ensure consistent format
         """
         if not type_name:
             return ''
-        from fixed_resolver import clean_type_name
-        return clean_type_name(type_name)
+        return sys.intern(clean_type_name(type_name))
     
-    def is_builtin_type(self, type_name: str) -> bool:
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def is_builtin_type(type_name: str) -> bool:
         """Check if type is an XML Schema built-in type"""
         if not type_name:
             return False
@@ -248,10 +531,7 @@ class DIGGSCompatibilityAnalyzer:
         else:
             bare_name = type_name
             
-        builtins = ['string', 'double', 'float', 'integer', 'int', 'long', 'short', 
-                   'byte', 'boolean', 'decimal', 'date', 'dateTime', 'time', 
-                   'anyURI', 'QName', 'anyType', 'anySimpleType']
-        return bare_name in builtins
+        return bare_name in _BUILTINS
     
     def check_type_content_compatibility(self, old_type: str, new_type: str, 
                                          depth: int = 0) -> Tuple[bool, str]:
@@ -265,96 +545,86 @@ class DIGGSCompatibilityAnalyzer:
         if depth > 5:
             return (True, "Max recursion depth reached")
         
-        # Check cache
-        cache_key = (old_type, new_type)
-        if cache_key in self.type_compat_cache:
-            return self.type_compat_cache[cache_key]
+        # Check cache, first by the names as given, then by their normalized form
+        # so that aliases like "Foo" and "diggs:Foo" share one entry
+        cache = self.type_compat_cache
+        raw_key = (old_type, new_type)
+        result = cache.get(raw_key)
+        if result is not None:
+            return result
         
         old_normalized = self.normalize_type_name(old_type)
         new_normalized = self.normalize_type_name(new_type)
         
+        cache_key = (old_normalized, new_normalized)
+        result = cache.get(cache_key)
+        if result is None:
+            result = cache[cache_key] = self._compare_content_models(
+                old_type, new_type, old_normalized, new_normalized, depth
+            )
+        cache[raw_key] = result
+        return result
+    
+    def _compare_content_models(self, old_type: str, new_type: str, old_normalized: str,
+                                new_normalized: str, depth: int) -> Tuple[bool, str]:
+        """Uncached body of check_type_content_compatibility"""
         # If types are identical, compatible
         if old_normalized == new_normalized:
-            result = (True, "Types identical")
-            self.type_compat_cache[cache_key] = result
-            return result
+            return (True, "Types identical")
         
         # Check if there's a known mapping
-        if old_normalized in self.type_mappings:
-            mapped = self.normalize_type_name(self.type_mappings[old_normalized])
-            if mapped == new_normalized:
-                result = (True, "Known mapping")
-                self.type_compat_cache[cache_key] = result
-                return result
+        if self._normalized_mappings.get(old_normalized) == new_normalized:
+            return (True, "Known mapping")
         
         # If either is a built-in type, we can't analyze further
         if self.is_builtin_type(old_type) or self.is_builtin_type(new_type):
             if old_normalized == new_normalized:
-                result = (True, "Same built-in type")
-            else:
-                result = (False, f"Built-in type change: {old_normalized} → {new_normalized}")
-            self.type_compat_cache[cache_key] = result
-            return result
+                return (True, "Same built-in type")
+            return (False, f"Built-in type change: {old_normalized} → {new_normalized}")
         
         # Both should be complex types - compare their content models
         if old_normalized not in self.old_types:
-            result = (False, f"Old type {old_normalized} not found in old schema")
-            self.type_compat_cache[cache_key] = result
-            return result
+            return (False, f"Old type {old_normalized} not found in old schema")
         
         if new_normalized not in self.new_types:
-            result = (False, f"New type {new_normalized} not found in new schema")
-            self.type_compat_cache[cache_key] = result
-            return result
+            return (False, f"New type {new_normalized} not found in new schema")
         
         # Resolve content models for both types
         try:
-            cm_old_elements, cm_old_attrs = resolve_content_model(
-                old_normalized, self.old_types, self.old_attrs, NS_26
-            )
-            cm_new_elements, cm_new_attrs = resolve_content_model(
-                new_normalized, self.new_types, self.new_attrs, NS_3
-            )
+            cm_old = self._resolve_old(old_normalized)
+            cm_new = self._resolve_new(new_normalized)
         except Exception as e:
-            result = (False, f"Error resolving content models: {str(e)}")
-            self.type_compat_cache[cache_key] = result
-            return result
+            return (False, f"Error resolving content models: {str(e)}")
         
         # Check for backward compatibility
-        names_old = set(cm_old_elements.keys())
-        names_new = set(cm_new_elements.keys())
-        attr_names_old = set(cm_old_attrs.keys())
-        attr_names_new = set(cm_new_attrs.keys())
+        cm_old_elements, cm_old_attrs = cm_old.elements, cm_old.attrs
+        cm_new_elements, cm_new_attrs = cm_new.elements, cm_new.attrs
+        names_old, attr_names_old = cm_old.names, cm_old.attr_names
+        names_new, attr_names_new = cm_new.names, cm_new.attr_names
         
         # Missing elements (incompatible)
         missing_elems = names_old - names_new
         if missing_elems:
-            result = (False, f"Missing elements: {', '.join(sorted(list(missing_elems)[:3]))}")
-            self.type_compat_cache[cache_key] = result
-            return result
+            return (False, f"Missing elements: {', '.join(sorted(list(missing_elems)[:3]))}")
         
         # Missing attributes (incompatible)
         missing_attrs = attr_names_old - attr_names_new
         if missing_attrs:
-            result = (False, f"Missing attributes: {', '.join(sorted(list(missing_attrs)[:3]))}")
-            self.type_compat_cache[cache_key] = result
-            return result
+            return (False, f"Missing attributes: {', '.join(sorted(list(missing_attrs)[:3]))}")
         
-        # New required elements (incompatible)
+        # New required elements (incompatible); skipped when nothing new is required
         new_elems = names_new - names_old
-        for elem_name in new_elems:
-            if cm_new_elements[elem_name]['minOccurs'] != '0':
-                result = (False, f"New required element: {elem_name}")
-                self.type_compat_cache[cache_key] = result
-                return result
+        if not cm_new.required_names.isdisjoint(new_elems):
+            for elem_name in new_elems:
+                if elem_name in cm_new.required_names:
+                    return (False, f"New required element: {elem_name}")
         
         # New required attributes (incompatible)
         new_attrs = attr_names_new - attr_names_old
-        for attr_name in new_attrs:
-            if cm_new_attrs[attr_name]['use'] == 'required':
-                result = (False, f"New required attribute: {attr_name}")
-                self.type_compat_cache[cache_key] = result
-                return result
+        if not cm_new.required_attr_names.isdisjoint(new_attrs):
+            for attr_name in new_attrs:
+                if attr_name in cm_new.required_attr_names:
+                    return (False, f"New required attribute: {attr_name}")
         
         # Check cardinality restrictions (incompatible)
         common_elems = names_old & names_new
@@ -362,25 +632,19 @@ class DIGGSCompatibilityAnalyzer:
             e_old = cm_old_elements[elem_name]
             e_new = cm_new_elements[elem_name]
             
-            min_old = int(e_old['minOccurs']) if e_old['minOccurs'].isdigit() else 0
-            min_new = int(e_new['minOccurs']) if e_new['minOccurs'].isdigit() else 0
-            max_old = 999999 if e_old['maxOccurs'] == 'unbounded' else int(e_old['maxOccurs']) if e_old['maxOccurs'].isdigit() else 1
-            max_new = 999999 if e_new['maxOccurs'] == 'unbounded' else int(e_new['maxOccurs']) if e_new['maxOccurs'].isdigit() else 1
+            min_old, max_old = cm_old.occurs[elem_name]
+            min_new, max_new = cm_new.occurs[elem_name]
             
             if min_new > min_old or max_new < max_old:
-                result = (False, f"Cardinality restricted on element: {elem_name}")
-                self.type_compat_cache[cache_key] = result
-                return result
+                return (False, f"Cardinality restricted on element: {elem_name}")
             
             # Recursively check if element type changes are compatible
-            if e_old['type'] != e_new['type'] and e_new['type']:
+            if e_old.type != e_new.type and e_new.type:
                 elem_type_compat, elem_reason = self.check_type_content_compatibility(
-                    e_old['type'], e_new['type'], depth + 1
+                    e_old.type, e_new.type, depth + 1
                 )
                 if not elem_type_compat:
-                    result = (False, f"Incompatible type change on {elem_name}: {elem_reason}")
-                    self.type_compat_cache[cache_key] = result
-                    return result
+                    return (False, f"Incompatible type change on {elem_name}: {elem_reason}")
         
         # Check attribute use restrictions (incompatible)
         common_attrs = attr_names_old & attr_names_new
@@ -388,75 +652,78 @@ class DIGGSCompatibilityAnalyzer:
             a_old = cm_old_attrs[attr_name]
             a_new = cm_new_attrs[attr_name]
             
-            if a_old['use'] == 'optional' and a_new['use'] == 'required':
-                result = (False, f"Attribute now required: {attr_name}")
-                self.type_compat_cache[cache_key] = result
-                return result
+            if a_old.use == 'optional' and a_new.use == 'required':
+                return (False, f"Attribute now required: {attr_name}")
         
         # All checks passed - types are compatible!
-        result = (True, "Content models compatible")
-        self.type_compat_cache[cache_key] = result
-        return result
+        return (True, "Content models compatible")
+    
+    def _resolve_cached(self, cache: Dict, type_name: str, all_types: Dict, all_attrs: Dict,
+                        namespaces: dict) -> _ContentModel:
+        """Resolve a content model once and keep it in cache"""
+        cached = cache.get(type_name)
+        if cached is None:
+            elements, attrs = resolve_content_model(type_name, all_types, all_attrs, namespaces)
+            cached = cache[type_name] = _ContentModel(
+                elements, attrs, frozenset(elements), frozenset(attrs),
+                sorted(elements), sorted(attrs),
+                {name: _occurs_range(elem) for name, elem in elements.items()},
+                frozenset(name for name, elem in elements.items() if elem.minOccurs != '0'),
+                frozenset(name for name, attr in attrs.items() if attr.use == 'required')
+            )
+        return cached
+    
+    def _resolve_old(self, type_name: str) -> _ContentModel:
+        """Content model of an old type
+        
+        The cached model is shared by every caller and must be treated as read-only.
+        """
+        return self._resolve_cached(self._cm_old_cache, type_name,
+                                    self.old_types, self.old_attrs, NS_26)
+    
+    def _resolve_new(self, type_name: str) -> _ContentModel:
+        """Content model of a new type; see _resolve_old"""
+        return self._resolve_cached(self._cm_new_cache, type_name,
+                                    self.new_types, self.new_attrs, NS_3)
     
     def is_type_change_compatible(self, old_type: str, new_type: str) -> Tuple[bool, str]:
         """Check if a type change is backward compatible"""
         if not old_type or not new_type:
             return (True, "Empty type")
         
-        # First check simple cases
-        old_normalized = self.normalize_type_name(old_type)
-        new_normalized = self.normalize_type_name(new_type)
-        
-        if old_normalized == new_normalized:
-            return (True, "Types identical")
-        
-        if old_normalized in self.type_mappings:
-            mapped_type = self.normalize_type_name(self.type_mappings[old_normalized])
-            if mapped_type == new_normalized:
-                return (True, "Known mapping")
-        
-        # Now do deep content model comparison
+        # Identical and mapped types are handled (and cached) by the content model check
         return self.check_type_content_compatibility(old_type, new_type, depth=0)
     
     def format_cardinality(self, min_occ: str, max_occ: str) -> str:
         """Format cardinality as (min..max)"""
         return f"({min_occ}..{max_occ})"
     
-    def compare_type(self, qualified_name: str, mapped_name: Optional[str] = None) -> Dict:
+    def compare_type(self, qualified_name: str, mapped_name: Optional[str] = None) -> TypeCompareResult:
         """Compare a single type between old and new versions
         
         Args:
             qualified_name: Qualified name like "diggs:AbstractFeature" or "eml:LengthMeasure"
             mapped_name: Optional mapped/renamed qualified name in new version
         """
-        result = {
-            'name': qualified_name,  # Now includes namespace prefix
-            'type_removed': '',
-            'base_changed': '',
-            'structure_changes': '',
-            'new_elements': [],
-            'missing_elements': [],
-            'expanded_cardinality': [],
-            'restricted_cardinality': [],
-            'type_changes': [],
-            'notes': '',
-            'compatible': 'Yes'
-        }
+        result = TypeCompareResult(qualified_name)
         
         ct_old = self.old_types.get(qualified_name)
         ct_new = self.new_types.get(mapped_name if mapped_name else qualified_name)
         
         if ct_new is None:
-            result['type_removed'] = 'Yes'
-            result['compatible'] = 'No'
-            result['notes'] = 'Type not found in new version'
+            result.type_removed = 'Yes'
+            result.compatible = 'No'
+            result.notes = 'Type not found in new version'
             return result
         
-        result['type_removed'] = 'No'
+        result.type_removed = 'No'
+        
+        # Joined into result.notes once all checks have run
+        notes = []
         
         if mapped_name:
-            result['type_removed'] = f'Renamed to: {mapped_name}'
-            result['notes'] = f'Type renamed from {qualified_name} to {mapped_name}'
+            result.type_removed = f'Renamed to: {mapped_name}'
+            notes.append(f'Type renamed from {qualified_name} to {mapped_name}')
         
         # Compare base types
         base_old = get_base_type_name(ct_old, NS_26)
@@ -464,107 +731,102 @@ class DIGGSCompatibilityAnalyzer:
         
         if base_old != base_new:
             if base_new:
-                result['base_changed'] = f"{base_new} (was: {base_old if base_old else 'none'})"
+                result.base_changed = f"{base_new} (was: {base_old if base_old else 'none'})"
         
         # Resolve content models
-        cm_old_elements, cm_old_attrs = resolve_content_model(
-            qualified_name, self.old_types, self.old_attrs, NS_26
+        cm_old = self._resolve_old(qualified_name)
+        cm_new = self._resolve_new(mapped_name if mapped_name else qualified_name)
+        cm_old_elements, cm_old_attrs = cm_old.elements, cm_old.attrs
+        cm_new_elements, cm_new_attrs = cm_new.elements, cm_new.attrs
+        
+        # Merging the pre-sorted name lists keeps every loop below in sorted order
+        new_elem_names, missing_elem_names, common_elems = _diff_sorted(
+            cm_old.sorted_names, cm_new.sorted_names
         )
-        cm_new_elements, cm_new_attrs = resolve_content_model(
-            mapped_name if mapped_name else qualified_name, self.new_types, self.new_attrs, NS_3
+        new_attr_names, missing_attr_names, common_attrs = _diff_sorted(
+            cm_old.sorted_attr_names, cm_new.sorted_attr_names
         )
         
-        names_old = set(cm_old_elements.keys())
-        names_new = set(cm_new_elements.keys())
-        attr_names_old = set(cm_old_attrs.keys())
-        attr_names_new = set(cm_new_attrs.keys())
-        
         # New elements/attributes
-        new_elem_names = names_new - names_old
-        for elem_name in sorted(new_elem_names):
+        for elem_name in new_elem_names:
             elem = cm_new_elements[elem_name]
-            card = self.format_cardinality(elem['minOccurs'], elem['maxOccurs'])
-            result['new_elements'].append(f"{elem_name}{card}")
-            if elem['minOccurs'] != '0':
-                result['compatible'] = 'No'
-                result['notes'] += f'; New required element: {elem_name}' if result['notes'] else f'New required element: {elem_name}'
-        
-        new_attr_names = attr_names_new - attr_names_old
-        for attr_name in sorted(new_attr_names):
+            card = self.format_cardinality(elem.minOccurs, elem.maxOccurs)
+            result.new_elements.append(f"{elem_name}{card}")
+            if elem.minOccurs != '0':
+                result.compatible = 'No'
+                notes.append(f'New required element: {elem_name}')
+        
+        for attr_name in new_attr_names:
             attr = cm_new_attrs[attr_name]
-            result['new_elements'].append(f"@{attr_name}({attr['use']})")
-            if attr['use'] == 'required':
-                result['compatible'] = 'No'
-                result['notes'] += f'; New required attribute: {attr_name}' if result['notes'] else f'New required attribute: {attr_name}'
+            result.new_elements.append(f"@{attr_name}({attr.use})")
+            if attr.use == 'required':
+                result.compatible = 'No'
+                notes.append(f'New required attribute: {attr_name}')
         
         # Missing elements/attributes
-        missing_elem_names = names_old - names_new
-        for elem_name in sorted(missing_elem_names):
-            result['missing_elements'].append(elem_name)
-            result['compatible'] = 'No'
-            result['notes'] += f'; Element removed: {elem_name}' if result['notes'] else f'Element removed: {elem_name}'
-        
-        missing_attr_names = attr_names_old - attr_names_new
-        for attr_name in sorted(missing_attr_names):
-            result['missing_elements'].append(f"@{attr_name}")
-            result['compatible'] = 'No'
-            result['notes'] += f'; Attribute removed: {attr_name}' if result['notes'] else f'Attribute removed: {attr_name}'
+        for elem_name in missing_elem_names:
+            result.missing_elements.append(elem_name)
+            result.compatible = 'No'
+            notes.append(f'Element removed: {elem_name}')
+        
+        for attr_name in missing_attr_names:
+            result.missing_elements.append(f"@{attr_name}")
+            result.compatible = 'No'
+            notes.append(f'Attribute removed: {attr_name}')
         
         # Check common elements
-        common_elems = names_old & names_new
-        for elem_name in sorted(common_elems):
+        for elem_name in common_elems:
             e_old = cm_old_elements[elem_name]
             e_new = cm_new_elements[elem_name]
             
-            min_old = int(e_old['minOccurs']) if e_old['minOccurs'].isdigit() else 0
-            min_new = int(e_new['minOccurs']) if e_new['minOccurs'].isdigit() else 0
-            max_old = 999999 if e_old['maxOccurs'] == 'unbounded' else int(e_old['maxOccurs']) if e_old['maxOccurs'].isdigit() else 1
-            max_new = 999999 if e_new['maxOccurs'] == 'unbounded' else int(e_new['maxOccurs']) if e_new['maxOccurs'].isdigit() else 1
+            min_old, max_old = cm_old.occurs[elem_name]
+            min_new, max_new = cm_new.occurs[elem_name]
             
             if min_new < min_old or max_new > max_old:
-                card = self.format_cardinality(e_new['minOccurs'], e_new['maxOccurs'])
-                result['expanded_cardinality'].append(f"{elem_name}{card}")
+                card = self.format_cardinality(e_new.minOccurs, e_new.maxOccurs)
+                result.expanded_cardinality.append(f"{elem_name}{card}")
             elif min_new > min_old or max_new < max_old:
-                card = self.format_cardinality(e_new['minOccurs'], e_new['maxOccurs'])
-                result['restricted_cardinality'].append(f"{elem_name}{card}")
-                result['compatible'] = 'No'
-                result['notes'] += f'; Cardinality restricted: {elem_name}' if result['notes'] else f'Cardinality restricted: {elem_name}'
+                card = self.format_cardinality(e_new.minOccurs, e_new.maxOccurs)
+                result.restricted_cardinality.append(f"{elem_name}{card}")
+                result.compatible = 'No'
+                notes.append(f'Cardinality restricted: {elem_name}')
             
             # Type changes
-            if e_old['type'] != e_new['type'] and e_new['type']:
+            if e_old.type != e_new.type and e_new.type:
                 type_compatible, compat_reason = self.is_type_change_compatible(
-                    e_old['type'], e_new['type']
+                    e_old.type, e_new.type
                 )
                 
-                type_note = f"{elem_name}: {e_old['type']} → {e_new['type']}"
+                type_note = f"{elem_name}: {e_old.type} → {e_new.type}"
                 
                 if type_compatible:
-                    result['type_changes'].append(f"{type_note} [OK]")
+                    result.type_changes.append(f"{type_note} [OK]")
                 else:
-                    result['type_changes'].append(f"{type_note} [INCOMPATIBLE: {compat_reason}]")
-                    result['compatible'] = 'No'
-                    result['notes'] += f'; Incompatible type change: {elem_name} ({compat_reason})' if result['notes'] else f'Incompatible type change: {elem_name} ({compat_reason})'
+                    result.type_changes.append(f"{type_note} [INCOMPATIBLE: {compat_reason}]")
+                    result.compatible = 'No'
+                    notes.append(f'Incompatible type change: {elem_name} ({compat_reason})')
         
         # Check attribute use changes
-        common_attrs = attr_names_old & attr_names_new
-        for attr_name in sorted(common_attrs):
+        for attr_name in common_attrs:
             a_old = cm_old_attrs[attr_name]
             a_new = cm_new_attrs[attr_name]
             
-            if a_old['use'] == 'required' and a_new['use'] == 'optional':
-                result['expanded_cardinality'].append(f"@{attr_name}(optional)")
-            elif a_old['use'] == 'optional' and a_new['use'] == 'required':
-                result['restricted_cardinality'].append(f"@{attr_name}(required)")
-                result['compatible'] = 'No'
-                result['notes'] += f'; Attribute now required: {attr_name}' if result['notes'] else f'Attribute now required: {attr_name}'
+            if a_old.use == 'required' and a_new.use == 'optional':
+                result.expanded_cardinality.append(f"@{attr_name}(optional)")
+            elif a_old.use == 'optional' and a_new.use == 'required':
+                result.restricted_cardinality.append(f"@{attr_name}(required)")
+                result.compatible = 'No'
+                notes.append(f'Attribute now required: {attr_name}')
         
         # Final note for base type changes
-        if result['compatible'] == 'Yes' and result['base_changed']:
-            result['notes'] = 'Base type changed but content model compatible (architectural refactoring)'
+        if result.compatible == 'Yes' and result.base_changed:
+            result.notes = 'Base type changed but content model compatible (architectural refactoring)'
+        else:
+            result.notes = '; '.join(notes)
         
         return result
     
-    def compare_simpletype(self, qualified_name: str, mapped_name: Optional[str] = None) -> Dict:
+    def compare_simpletype(self, qualified_name: str, mapped_name: Optional[str] = None) -> SimpleTypeCompareResult:
         """Compare a simple type between old and new versions
         
         Analyzes:
@@ -576,31 +838,30 @@ class DIGGSCompatibilityAnalyzer:
             qualified_name: Qualified name like "diggs:SomeSimpleType" or "eml:UnitlessMeasure"
             mapped_name: Optional mapped/renamed qualified name in new version
         """
-        result = {
-            'name': qualified_name,  # Now includes namespace prefix
-            'type_removed': '',
-            'base_changed': '',
-            'enumerations_removed': [],
-            'enumerations_added': [],
-            'pattern_changed': '',
-            'notes': '',
-            'compatible': 'Yes'
-        }
+        result = SimpleTypeCompareResult(qualified_name)
         
         st_old = self.old_simpletypes.get(qualified_name)
         st_new = self.new_simpletypes.get(mapped_name if mapped_name else qualified_name)
         
         if st_new is None:
-            result['type_removed'] = 'Yes'
-            result['compatible'] = 'No'
-            result['notes'] = 'SimpleType not found in new version'
+            result.type_removed = 'Yes'
+            result.compatible = 'No'
+            result.notes = 'SimpleType not found in new version'
             return result
         
-        result['type_removed'] = 'No'
+        result.type_removed = 'No'
+        
+        # Joined into result.notes once all checks have run
+        notes = []
         
         if mapped_name:
-            result['type_removed'] = f'Renamed to: {mapped_name}'
-            result['notes'] = f'SimpleType renamed from {qualified_name} to {mapped_name}'
+            result.type_removed = f'Renamed to: {mapped_name}'
+            notes.append(f'SimpleType renamed from {qualified_name} to {mapped_name}')
+        
+        # An unchanged definition has no enumeration, pattern or base changes to report
+        if st_old is not None and _elements_equal(st_old, st_new):
+            result.notes = '; '.join(notes)
+            return result
         
         # Extract enumerations
         old_enums = self._extract_enumerations(st_old)
@@ -610,24 +871,24 @@ class DIGGSCompatibilityAnalyzer:
             # Check for removed enumerations (incompatible)
             removed_enums = old_enums - new_enums
             if removed_enums:
-                result['enumerations_removed'] = sorted(list(removed_enums))
-                result['compatible'] = 'No'
+                result.enumerations_removed = sorted(list(removed_enums))
+                result.compatible = 'No'
                 count = len(removed_enums)
                 sample = ', '.join(sorted(list(removed_enums))[:3])
                 if count > 3:
                     sample += f'... (+{count-3} more)'
-                result['notes'] += f'; Removed enumerations: {sample}' if result['notes'] else f'Removed enumerations: {sample}'
+                notes.append(f'Removed enumerations: {sample}')
             
             # Check for added enumerations (compatible - expands options)
             added_enums = new_enums - old_enums
             if added_enums:
-                result['enumerations_added'] = sorted(list(added_enums))
+                result.enumerations_added = sorted(list(added_enums))
                 count = len(added_enums)
                 sample = ', '.join(sorted(list(added_enums))[:3])
                 if count > 3:
                     sample += f'... (+{count-3} more)'
                 note = f'Added enumerations: {sample}'
-                result['notes'] += f'; {note}' if result['notes'] else note
+                notes.append(note)
         
         # Extract patterns
         old_pattern = self._extract_pattern(st_old)
@@ -635,25 +896,26 @@ class DIGGSCompatibilityAnalyzer:
         
         if old_pattern != new_pattern:
             if old_pattern and new_pattern:
-                result['pattern_changed'] = f'Changed from "{old_pattern}" to "{new_pattern}"'
-                result['notes'] += '; Pattern changed (review for compatibility)' if result['notes'] else 'Pattern changed (review for compatibility)'
+                result.pattern_changed = f'Changed from "{old_pattern}" to "{new_pattern}"'
+                notes.append('Pattern changed (review for compatibility)')
             elif old_pattern and not new_pattern:
-                result['pattern_changed'] = f'Removed: "{old_pattern}"'
-                result['notes'] += '; Pattern removed (may expand valid values)' if result['notes'] else 'Pattern removed (may expand valid values)'
+                result.pattern_changed = f'Removed: "{old_pattern}"'
+                notes.append('Pattern removed (may expand valid values)')
             elif not old_pattern and new_pattern:
-                result['pattern_changed'] = f'Added: "{new_pattern}"'
-                result['compatible'] = 'No'
-                result['notes'] += f'; Pattern added: "{new_pattern}" (restricts values)' if result['notes'] else f'Pattern added: "{new_pattern}" (restricts values)'
+                result.pattern_changed = f'Added: "{new_pattern}"'
+                result.compatible = 'No'
+                notes.append(f'Pattern added: "{new_pattern}" (restricts values)')
         
         # Check base type
         old_base = self._extract_simpletype_base(st_old)
         new_base = self._extract_simpletype_base(st_new)
         
         if old_base != new_base:
-            result['base_changed'] = f'{new_base} (was: {old_base})'
+            result.base_changed = f'{new_base} (was: {old_base})'
             # Base type change could be incompatible, but depends on context
-            result['notes'] += f'; Base type changed from {old_base} to {new_base}' if result['notes'] else f'Base type changed from {old_base} to {new_base}'
+            notes.append(f'Base type changed from {old_base} to {new_base}')
         
+        result.notes = '; '.join(notes)
         return result
     
     def _extract_enumerations(self, simpletype) -> set:
@@ -692,96 +954,76 @@ class DIGGSCompatibilityAnalyzer:
         if restriction is not None:
             base = restriction.get('base', '')
             if base:
-                from fixed_resolver import clean_type_name
                 return clean_type_name(base)
         
         return ''
     
     
-    def analyze(self) -> List[Dict]:
+    def analyze(self) -> Tuple[List[TypeCompareResult], List[SimpleTypeCompareResult]]:
         """Run the full compatibility analysis"""
         print("="*80)
         print("DIGGS SCHEMA COMPATIBILITY ANALYZER")
         print("="*80)
         
+        self.type_compat_cache.clear()
+        self._cm_old_cache.clear()
+        self._cm_new_cache.clear()
+        
         # Detect versions
         print("\nDetecting versions...")
-        self.old_version = self.detect_version(self.old_dir)
-        self.new_version = self.detect_version(self.new_dir)
+        old_files, old_versions = self._scan_schema_tree(self.old_dir)
+        self.old_version = self._select_version(self.old_dir, old_versions)
+        new_files, new_versions = self._scan_schema_tree(self.new_dir)
+        self.new_version = self._select_version(self.new_dir, new_versions)
         print(f"  Old version: {self.old_version}")
         print(f"  New version: {self.new_version}")
         
         # Load type mappings
         self.type_mappings = self.load_mappings()
+        self._bare_to_mapping = {old: new for old, new in self.type_mappings.items() if ':' not in old}
+        self._normalized_mappings = {
+            old: self.normalize_type_name(new) for old, new in self.type_mappings.items()
+        }
         
         # Load schemas
-        self.old_schemas, self.old_types, self.old_attrs, self.old_simpletypes = self.load_schemas(
-            self.old_dir, NS_26
+        _, self.old_types, self.old_attrs, self.old_simpletypes = self.load_schemas(
+            self.old_dir, NS_26, old_files
         )
-        self.new_schemas, self.new_types, self.new_attrs, self.new_simpletypes = self.load_schemas(
-            self.new_dir, NS_3
+        _, self.new_types, self.new_attrs, self.new_simpletypes = self.load_schemas(
+            self.new_dir, NS_3, new_files
         )
         
         # Compare types
         print(f"\nComparing {len(self.old_types)} types...")
-        results = []
+        pairs = []
         
-        for i, qualified_name in enumerate(sorted(self.old_types.keys()), 1):
-            if i % 100 == 0:
-                print(f"  Progress: {i}/{len(self.old_types)}")
-            
+        for qualified_name in sorted(self.old_types.keys()):
             # qualified_name is already in format "namespace:typename"
-            # Try exact match in mappings first
-            mapped_name = self.type_mappings.get(qualified_name)
-            
-            # If not found, try bare name for backward compatibility
-            if not mapped_name:
-                bare_name = qualified_name.split(':')[-1]
-                mapped_name = self.type_mappings.get(bare_name)
-                # If found with bare name, qualify it with same namespace as target
-                if mapped_name and ':' not in mapped_name:
-                    # Extract namespace from old qualified name
-                    ns_prefix = qualified_name.split(':')[0]
-                    # Check if target exists with same namespace
-                    potential_new = f"{ns_prefix}:{mapped_name}"
-                    if potential_new in self.new_types:
-                        mapped_name = potential_new
-            
-            result = self.compare_type(qualified_name, mapped_name)
-            results.append(result)
+            pairs.append((qualified_name, self._resolve_mapping(qualified_name, self.new_types)))
+        
+        results = self._run_comparisons(pairs, self.compare_type, _compare_types_chunk)
         
         # Compare simpleTypes
         print(f"\nComparing {len(self.old_simpletypes)} simpleTypes...")
-        simpletype_results = []
+        pairs = []
         
-        for i, qualified_name in enumerate(sorted(self.old_simpletypes.keys()), 1):
-            if i % 100 == 0:
-                print(f"  Progress: {i}/{len(self.old_simpletypes)}")
-            
-            # Try exact match in mappings first
-            mapped_name = self.type_mappings.get(qualified_name)
-            
-            # If not found, try bare name for backward compatibility
-            if not mapped_name:
-                bare_name = qualified_name.split(':')[-1]
-                mapped_name = self.type_mappings.get(bare_name)
-                if mapped_name and ':' not in mapped_name:
-                    ns_prefix = qualified_name.split(':')[0]
-                    potential_new = f"{ns_prefix}:{mapped_name}"
-                    if potential_new in self.new_simpletypes:
-                        mapped_name = potential_new
-            
-            result = self.compare_simpletype(qualified_name, mapped_name)
-            simpletype_results.append(result)
+        for qualified_name in sorted(self.old_simpletypes.keys()):
+            pairs.append((qualified_name, self._resolve_mapping(qualified_name, self.new_simpletypes)))
         
-        # Clear cache to free memory
+        simpletype_results = self._run_comparisons(
+            pairs, self.compare_simpletype, _compare_simpletypes_chunk
+        )
+        
+        # Clear caches to free memory
         self.type_compat_cache.clear()
+        self._cm_old_cache.clear()
+        self._cm_new_cache.clear()
         
         # Statistics
-        removed = sum(1 for r in results if r['type_removed'] == 'Yes')
-        renamed = sum(1 for r in results if r['type_removed'].startswith('Renamed'))
-        compatible = sum(1 for r in results if r['compatible'] == 'Yes')
-        incompatible = sum(1 for r in results if r['compatible'] == 'No' and r['type_removed'] != 'Yes')
+        removed = sum(1 for r in results if r.type_removed == 'Yes')
+        renamed = sum(1 for r in results if r.type_removed.startswith('Renamed'))
+        compatible = sum(1 for r in results if r.compatible == 'Yes')
+        incompatible = sum(1 for r in results if r.compatible == 'No' and r.type_removed != 'Yes')
         
         print(f"\nResults:")
         print(f"  Compatible: {compatible} ({100*compatible/len(results):.1f}%)")
@@ -791,15 +1033,75 @@ class DIGGSCompatibilityAnalyzer:
         
         return results, simpletype_results
     
-    def generate_excel_report(self, results: List[Dict], simpletype_results: List[Dict], output_file: str):
-        """Generate Excel workbook with analysis results"""
+    def _resolve_mapping(self, qualified_name: str, new_names: Dict) -> Optional[str]:
+        """Find the new name an old qualified type maps to, if any
+        
+        Args:
+            qualified_name: Old qualified name like "diggs:SomeType"
+            new_names: New types of the same kind, used to qualify bare mapping targets
+        
+        Returns:
+            Mapped name, or None when the type has no mapping
+        """
+        # Try exact match in mappings first
+        mapped_name = self.type_mappings.get(qualified_name)
+        if mapped_name:
+            return mapped_name
+        
+        # If not found, try bare name for backward compatibility
+        parts = qualified_name.split(':')
+        mapped_name = self._bare_to_mapping.get(parts[-1])
+        # If found with bare name, qualify it with the old namespace when that type exists
+        if mapped_name and ':' not in mapped_name:
+            potential_new = f"{parts[0]}:{mapped_name}"
+            if potential_new in new_names:
+                return potential_new
+        return mapped_name
+    
+    def _run_comparisons(self, pairs: List[Tuple[str, Optional[str]]], compare,
+                         compare_chunk) -> List:
+        """Compare (qualified_name, mapped_name) pairs, in worker processes when worthwhile
+        
+        Args:
+            pairs: Names to compare, in report order
+            compare: Bound method used when running in-process
+            compare_chunk: Module-level function run by the workers on each shard
+        
+        Returns:
+            One result per pair, in the order of pairs
+        """
+        total = len(pairs)
+        results = []
+        
+        if self.jobs <= 1 or total < PARALLEL_MIN_TYPES:
+            for i, (qualified_name, mapped_name) in enumerate(pairs, 1):
+                if i % 100 == 0:
+                    print(f"  Progress: {i}/{total}")
+                results.append(compare(qualified_name, mapped_name))
+            return results
+        
+        # Workers get a copy of the loaded schemas once, through the initializer
+        with ProcessPoolExecutor(max_workers=self.jobs, initializer=_init_worker,
+                                 initargs=(self,)) as pool:
+            for chunk_results in pool.map(compare_chunk, _shards(pairs, self.jobs * 4)):
+                results.extend(chunk_results)
+                print(f"  Progress: {len(results)}/{total}")
+        
+        return results
+    
+    def generate_excel_report(self, results: List[TypeCompareResult],
+                              simpletype_results: List[SimpleTypeCompareResult], output_file: str):
+        """Generate Excel workbook with analysis results
+        
+        The workbook is write-only: rows are streamed to disk as they are appended, so
+        column widths and frozen panes are set on each sheet before its first row.
+        """
         print(f"\nGenerating Excel report: {output_file}")
         
-        wb = Workbook()
+        wb = Workbook(write_only=True)
         
         # Sheet 1: ComplexTypes comparison
-        ws = wb.active
-        ws.title = "ComplexTypes"
+        ws = wb.create_sheet('ComplexTypes')
         
         headers = [
             'Complex Type Name', 'Type Removed',
@@ -809,38 +1111,8 @@ class DIGGSCompatibilityAnalyzer:
             'Notes', 'Backward Compatible'
         ]
         
-        for col, header in enumerate(headers, 1):
-            cell = ws.cell(1, col)
-            cell.value = header
-            cell.font = Font(bold=True, color='FFFFFF')
-            cell.fill = PatternFill(start_color='366092', end_color='366092', fill_type='solid')
-            cell.alignment = Alignment(wrap_text=True, vertical='top')
-        
-        for row_idx, r in enumerate(results, 2):
-            ws.cell(row_idx, 1).value = r['name']  # Now includes namespace prefix
-            ws.cell(row_idx, 2).value = r['type_removed']
-            ws.cell(row_idx, 3).value = r['base_changed']
-            ws.cell(row_idx, 4).value = r['structure_changes']
-            ws.cell(row_idx, 5).value = '\n'.join(r['new_elements'][:10])
-            ws.cell(row_idx, 6).value = '\n'.join(r['missing_elements'][:10])
-            ws.cell(row_idx, 7).value = '\n'.join(r['expanded_cardinality'][:10])
-            ws.cell(row_idx, 8).value = '\n'.join(r['restricted_cardinality'][:10])
-            ws.cell(row_idx, 9).value = '\n'.join(r['type_changes'][:10])
-            ws.cell(row_idx, 10).value = r['notes']
-            ws.cell(row_idx, 11).value = r['compatible']
-            
-            compat_cell = ws.cell(row_idx, 11)
-            if r['compatible'] == 'No':
-                compat_cell.fill = PatternFill(start_color='FFC7CE', end_color='FFC7CE', fill_type='solid')
-            else:
-                compat_cell.fill = PatternFill(start_color='C6EFCE', end_color='C6EFCE', fill_type='solid')
-            
-            for col in range(1, 12):
-                ws.cell(row_idx, col).alignment = Alignment(wrap_text=True, vertical='top')
-        
         ws.column_dimensions['A'].width = 50  # Wider for qualified names
         ws.column_dimensions['B'].width = 25
-        ws.column_dimensions['B'].width = 25
         ws.column_dimensions['C'].width = 35
         ws.column_dimensions['D'].width = 30
         ws.column_dimensions['E'].width = 30
@@ -852,128 +1124,88 @@ class DIGGSCompatibilityAnalyzer:
         ws.column_dimensions['K'].width = 18
         ws.freeze_panes = 'A2'
         
+        ws.append(_styled_cells(ws, headers, font=HEADER_FONT, fill=HEADER_FILL))
+        
+        for r in results:
+            row = _styled_cells(ws, [
+                r.name,  # Now includes namespace prefix
+                r.type_removed,
+                r.base_changed,
+                r.structure_changes,
+                '\n'.join(r.new_elements[:10]),
+                '\n'.join(r.missing_elements[:10]),
+                '\n'.join(r.expanded_cardinality[:10]),
+                '\n'.join(r.restricted_cardinality[:10]),
+                '\n'.join(r.type_changes[:10]),
+                r.notes,
+                r.compatible,
+            ])
+            row[10].fill = RED_FILL if r.compatible == 'No' else GREEN_FILL
+            ws.append(row)
+        
         # Sheet 2: Type Lists
         ws2 = wb.create_sheet('Type Lists')
         
-        ws2.cell(1, 1).value = f"{self.old_version} Types NOT in {self.new_version}"
-        ws2.cell(1, 1).font = Font(bold=True, size=14)
-        ws2.cell(1, 2).value = f"{self.new_version} Types NOT in {self.old_version}"
-        ws2.cell(1, 2).font = Font(bold=True, size=14)
-        
         old_names = set(self.old_types.keys())  # Already qualified
         new_names = set(self.new_types.keys())  # Already qualified
         
-        # Build sets of renamed types (to exclude from lists)
-        # Old types that were mapped to new types (renamed, not truly removed)
-        mapped_old_types = set()
-        for old_type, new_type in self.type_mappings.items():
-            # old_type might be qualified (eml:X) or bare (X)
-            # Check if it exists in old_names (which are qualified)
-            if old_type in old_names:
-                mapped_old_types.add(old_type)
-            else:
-                # Try to find it by bare name
-                bare_old = old_type.split(':')[-1]
-                for qualified_old in old_names:
-                    if qualified_old.endswith(':' + bare_old) or qualified_old == bare_old:
-                        mapped_old_types.add(qualified_old)
-                        break
-        
-        # New types that are targets of mappings (renamed from old, not truly new)
-        mapped_to_new_types = set()
-        for old_type, new_type in self.type_mappings.items():
-            if new_type in new_names:
-                mapped_to_new_types.add(new_type)
-            else:
-                # Try to find it by bare name
-                bare_new = new_type.split(':')[-1]
-                for qualified_new in new_names:
-                    if qualified_new.endswith(':' + bare_new) or qualified_new == bare_new:
-                        mapped_to_new_types.add(qualified_new)
-                        break
+        # Renamed types are excluded from the lists: old types mapped away and new
+        # types that are mapping targets are not truly removed or new
+        mapped_old_types = _mapped_names(old_names, self.type_mappings.keys())
+        mapped_to_new_types = _mapped_names(new_names, self.type_mappings.values())
         
         # Filter out renamed types - only show truly removed/new types
         old_not_in_new = sorted((old_names - new_names) - mapped_old_types)
         new_not_in_old = sorted((new_names - old_names) - mapped_to_new_types)
         
-        ws2.cell(2, 1).value = f"Count: {len(old_not_in_new)} (excludes renamed types)"
-        ws2.cell(2, 1).font = Font(bold=True)
-        for idx, qualified_name in enumerate(old_not_in_new, 3):
-            ws2.cell(idx, 1).value = qualified_name
-        
-        ws2.cell(2, 2).value = f"Count: {len(new_not_in_old)} (excludes renamed types)"
-        ws2.cell(2, 2).font = Font(bold=True)
-        for idx, qualified_name in enumerate(new_not_in_old, 3):
-            ws2.cell(idx, 2).value = qualified_name
-        
-        ws2.column_dimensions['A'].width = 50
-        ws2.column_dimensions['B'].width = 50
-        
-        # Add simpleTypes section
-        ws2.cell(1, 4).value = f"{self.old_version} SimpleTypes NOT in {self.new_version}"
-        ws2.cell(1, 4).font = Font(bold=True, size=14)
-        ws2.cell(1, 5).value = f"{self.new_version} SimpleTypes NOT in {self.old_version}"
-        ws2.cell(1, 5).font = Font(bold=True, size=14)
-        
         old_st_names = set(self.old_simpletypes.keys())  # Already qualified
         new_st_names = set(self.new_simpletypes.keys())  # Already qualified
         
         # Build sets of renamed simpleTypes (to exclude from lists)
-        mapped_old_simpletypes = set()
-        for old_type, new_type in self.type_mappings.items():
-            if old_type in old_st_names:
-                mapped_old_simpletypes.add(old_type)
-            else:
-                bare_old = old_type.split(':')[-1]
-                for qualified_old in old_st_names:
-                    if qualified_old.endswith(':' + bare_old) or qualified_old == bare_old:
-                        mapped_old_simpletypes.add(qualified_old)
-                        break
-        
-        mapped_to_new_simpletypes = set()
-        for old_type, new_type in self.type_mappings.items():
-            if new_type in new_st_names:
-                mapped_to_new_simpletypes.add(new_type)
-            else:
-                bare_new = new_type.split(':')[-1]
-                for qualified_new in new_st_names:
-                    if qualified_new.endswith(':' + bare_new) or qualified_new == bare_new:
-                        mapped_to_new_simpletypes.add(qualified_new)
-                        break
+        mapped_old_simpletypes = _mapped_names(old_st_names, self.type_mappings.keys())
+        mapped_to_new_simpletypes = _mapped_names(new_st_names, self.type_mappings.values())
         
         # Filter out renamed simpleTypes
         old_st_not_in_new = sorted((old_st_names - new_st_names) - mapped_old_simpletypes)
         new_st_not_in_old = sorted((new_st_names - old_st_names) - mapped_to_new_simpletypes)
         
-        ws2.cell(2, 4).value = f"Count: {len(old_st_not_in_new)} (excludes renamed types)"
-        ws2.cell(2, 4).font = Font(bold=True)
-        for idx, qualified_name in enumerate(old_st_not_in_new, 3):
-            ws2.cell(idx, 4).value = qualified_name
-        
-        ws2.cell(2, 5).value = f"Count: {len(new_st_not_in_old)} (excludes renamed types)"
-        ws2.cell(2, 5).font = Font(bold=True)
-        for idx, qualified_name in enumerate(new_st_not_in_old, 3):
-            ws2.cell(idx, 5).value = qualified_name
-        
+        ws2.column_dimensions['A'].width = 50
+        ws2.column_dimensions['B'].width = 50
         ws2.column_dimensions['D'].width = 50
         ws2.column_dimensions['E'].width = 50
         
+        # Types in columns A-B, simpleTypes in D-E; column C stays empty
+        ws2.append(_styled_cells(ws2, [
+            f"{self.old_version} Types NOT in {self.new_version}",
+            f"{self.new_version} Types NOT in {self.old_version}",
+            None,
+            f"{self.old_version} SimpleTypes NOT in {self.new_version}",
+            f"{self.new_version} SimpleTypes NOT in {self.old_version}",
+        ], font=TITLE_FONT, alignment=None))
+        ws2.append(_styled_cells(ws2, [
+            f"Count: {len(old_not_in_new)} (excludes renamed types)",
+            f"Count: {len(new_not_in_old)} (excludes renamed types)",
+            None,
+            f"Count: {len(old_st_not_in_new)} (excludes renamed types)",
+            f"Count: {len(new_st_not_in_old)} (excludes renamed types)",
+        ], font=BOLD_FONT, alignment=None))
+        for names in zip_longest(old_not_in_new, new_not_in_old, [],
+                                 old_st_not_in_new, new_st_not_in_old):
+            ws2.append(names)
+        
         # Sheet 3: Type Mappings Applied
         ws3 = wb.create_sheet('Type Mappings')
-        ws3.cell(1, 1).value = f"{self.old_version} Type Name"
-        ws3.cell(1, 1).font = Font(bold=True)
-        ws3.cell(1, 2).value = f"{self.new_version} Type Name"
-        ws3.cell(1, 2).font = Font(bold=True)
-        
-        row = 2
-        for old_name, new_name in sorted(self.type_mappings.items()):
-            ws3.cell(row, 1).value = old_name
-            ws3.cell(row, 2).value = new_name
-            row += 1
         
         ws3.column_dimensions['A'].width = 50
         ws3.column_dimensions['B'].width = 50
         
+        ws3.append(_styled_cells(ws3, [
+            f"{self.old_version} Type Name",
+            f"{self.new_version} Type Name",
+        ], font=BOLD_FONT, alignment=None))
+        for old_name, new_name in sorted(self.type_mappings.items()):
+            ws3.append([old_name, new_name])
+        
         # Sheet 4: SimpleTypes comparison
         ws4 = wb.create_sheet('SimpleTypes')
         
@@ -983,50 +1215,6 @@ class DIGGSCompatibilityAnalyzer:
             'Pattern Changed', 'Notes', 'Backward Compatible'
         ]
         
-        for col, header in enumerate(st_headers, 1):
-            cell = ws4.cell(1, col)
-            cell.value = header
-            cell.font = Font(bold=True, color='FFFFFF')
-            cell.fill = PatternFill(start_color='366092', end_color='366092', fill_type='solid')
-            cell.alignment = Alignment(wrap_text=True, vertical='top')
-        
-        for row_idx, r in enumerate(simpletype_results, 2):
-            ws4.cell(row_idx, 1).value = r['name']  # Now includes namespace prefix
-            ws4.cell(row_idx, 2).value = r['type_removed']
-            ws4.cell(row_idx, 3).value = r['base_changed']
-            
-            # Enumerations removed (incompatible)
-            removed_enums = r.get('enumerations_removed', [])
-            if removed_enums:
-                ws4.cell(row_idx, 4).value = '\n'.join(removed_enums[:20])  # Show up to 20
-                if len(removed_enums) > 20:
-                    current = ws4.cell(row_idx, 4).value
-                    ws4.cell(row_idx, 4).value = current + f'\n... (+{len(removed_enums)-20} more)'
-            
-            # Enumerations added (compatible - expands options)
-            added_enums = r.get('enumerations_added', [])
-            if added_enums:
-                ws4.cell(row_idx, 5).value = '\n'.join(added_enums[:20])  # Show up to 20
-                if len(added_enums) > 20:
-                    current = ws4.cell(row_idx, 5).value
-                    ws4.cell(row_idx, 5).value = current + f'\n... (+{len(added_enums)-20} more)'
-            
-            # Pattern changes
-            ws4.cell(row_idx, 6).value = r.get('pattern_changed', '')
-            
-            # Notes and compatibility
-            ws4.cell(row_idx, 7).value = r['notes']
-            ws4.cell(row_idx, 8).value = r['compatible']
-            
-            compat_cell = ws4.cell(row_idx, 8)
-            if r['compatible'] == 'No':
-                compat_cell.fill = PatternFill(start_color='FFC7CE', end_color='FFC7CE', fill_type='solid')
-            else:
-                compat_cell.fill = PatternFill(start_color='C6EFCE', end_color='C6EFCE', fill_type='solid')
-            
-            for col in range(1, 9):
-                ws4.cell(row_idx, col).alignment = Alignment(wrap_text=True, vertical='top')
-        
         ws4.column_dimensions['A'].width = 50
         ws4.column_dimensions['B'].width = 25
         ws4.column_dimensions['C'].width = 25
@@ -1037,6 +1225,25 @@ class DIGGSCompatibilityAnalyzer:
         ws4.column_dimensions['H'].width = 18
         ws4.freeze_panes = 'A2'
         
+        ws4.append(_styled_cells(ws4, st_headers, font=HEADER_FONT, fill=HEADER_FILL))
+        
+        for r in simpletype_results:
+            row = _styled_cells(ws4, [
+                r.name,  # Now includes namespace prefix
+                r.type_removed,
+                r.base_changed,
+                # Enumerations removed (incompatible), then added (compatible - expands options)
+                _enumeration_summary(r.enumerations_removed),
+                _enumeration_summary(r.enumerations_added),
+                # Pattern changes
+                r.pattern_changed,
+                # Notes and compatibility
+                r.notes,
+                r.compatible,
+            ])
+            row[7].fill = RED_FILL if r.compatible == 'No' else GREEN_FILL
+            ws4.append(row)
+        
         wb.save(output_file)
         print(f"  ✓ Report saved: {output_file}")
 
@@ -1091,6 +1298,13 @@ Type mappings file format (tab-separated):
         help='Output Excel file name (default: diggs_compatibility_analysis.xlsx)'
     )
     
+    parser.add_argument(
+        '--jobs',
+        type=int,
+        default=1,
+        help='Worker processes for comparing types (default: 1; 0 uses every CPU)'
+    )
+    
     args = parser.parse_args()
     
     try:
@@ -1098,7 +1312,8 @@ Type mappings file format (tab-separated):
         analyzer = DIGGSCompatibilityAnalyzer(
             args.old_dir,
             args.new_dir,
-            args.mappings
+            args.mappings,
+            args.jobs
         )
         
         # Run analysis
@@ -4,7 +4,9 @@ Fixed content model resolver - properly handles nested sequences
 """
 
 import xml.etree.ElementTree as ET
-from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import NamedTuple
 from openpyxl import load_workbook
 from openpyxl.styles import PatternFill
 
@@ -36,6 +38,34 @@ NS_PREFIX_TO_LABEL = {
     'xml': 'xml',  # XML namespace (for xml:lang, xml:id, etc.)
 }
 
+# Fill for cells re-marked compatible; ARGB with an opaque alpha
+GREEN_FILL = PatternFill(start_color='FFC6EFCE', end_color='FFC6EFCE', fill_type='solid')
+
+# Clark-notation tags of the XML Schema constructs; matched directly with iter()
+# instead of resolving an "xs:" path against a namespaces dict on every call
+XS = '{http://www.w3.org/2001/XMLSchema}'
+XS_COMPLEX_TYPE = XS + 'complexType'
+XS_SIMPLE_TYPE = XS + 'simpleType'
+XS_ATTRIBUTE = XS + 'attribute'
+XS_ELEMENT = XS + 'element'
+XS_SEQUENCE = XS + 'sequence'
+XS_CHOICE = XS + 'choice'
+XS_EXTENSION = XS + 'extension'
+XS_RESTRICTION = XS + 'restriction'
+
+class Elem(NamedTuple):
+    """An element of a content model; occurrences are the schema's strings"""
+    name: str
+    type: str
+    minOccurs: str
+    maxOccurs: str
+
+class Attr(NamedTuple):
+    """An attribute of a content model"""
+    name: str
+    type: str
+    use: str
+
 def parse_schema(filepath, namespaces):
     try:
         tree = ET.parse(filepath)
@@ -48,7 +78,7 @@ def get_all_types(schemas, namespaces):
     all_types = {}
     for schema in schemas:
         if schema is not None:
-            for ct in schema.findall('.//xs:complexType', namespaces):
+            for ct in schema.iter(XS_COMPLEX_TYPE):
                 name = ct.get('name')
                 if name:
                     all_types[name] = ct
@@ -58,7 +88,7 @@ def get_all_attributes(schemas, namespaces):
     all_attrs = {}
     for schema in schemas:
         if schema is not None:
-            for attr in schema.findall('.//xs:attribute', namespaces):
+            for attr in schema.iter(XS_ATTRIBUTE):
                 name = attr.get('name')
                 if name:
                     all_attrs[name] = attr
@@ -69,12 +99,37 @@ def get_all_simpletypes(schemas, namespaces):
     all_simpletypes = {}
     for schema in schemas:
         if schema is not None:
-            for st in schema.findall('.//xs:simpleType', namespaces):
+            for st in schema.iter(XS_SIMPLE_TYPE):
                 name = st.get('name')
                 if name:
                     all_simpletypes[name] = st
     return all_simpletypes
 
+def index_schemas(schemas, namespaces):
+    """Collect complexType, attribute and simpleType definitions in one walk per schema
+    
+    Returns (all_types, all_attrs, all_simpletypes), keyed by name as the
+    get_all_types, get_all_attributes and get_all_simpletypes functions key them.
+    """
+    all_types = {}
+    all_attrs = {}
+    all_simpletypes = {}
+    collected_by_tag = {
+        XS_COMPLEX_TYPE: all_types,
+        XS_ATTRIBUTE: all_attrs,
+        XS_SIMPLE_TYPE: all_simpletypes,
+    }
+    for schema in schemas:
+        if schema is not None:
+            for elem in schema.iter():
+                collected = collected_by_tag.get(elem.tag)
+                if collected is not None:
+                    name = elem.get('name')
+                    if name:
+                        collected[name] = elem
+    return all_types, all_attrs, all_simpletypes
+
+@lru_cache(maxsize=None)
 def clean_type_name(name):
     """Convert XSD type reference to qualified name format
     
@@ -84,6 +139,8 @@ def clean_type_name(name):
     - "gml:AbstractFeatureType" -> "gml:AbstractFeatureType"
     - "xs:string" -> "xs:string"
     - "SomeType" -> "SomeType" (no namespace)
+    
+    Results are memoized; the same few hundred references recur across every type.
     """
     if not name:
         return ''
@@ -99,13 +156,13 @@ def clean_type_name(name):
     return name
 
 def get_base_type_name(complex_type, namespaces):
-    extension = complex_type.find('.//xs:extension', namespaces)
+    extension = next(complex_type.iter(XS_EXTENSION), None)
     if extension is not None:
         base = extension.get('base')
         if base:
             return clean_type_name(base)
     
-    restriction = complex_type.find('.//xs:restriction', namespaces)
+    restriction = next(complex_type.iter(XS_RESTRICTION), None)
     if restriction is not None:
         base = restriction.get('base')
         if base:
@@ -113,21 +170,22 @@ def get_base_type_name(complex_type, namespaces):
     
     return None
 
-def extract_elements_from_node(node, namespaces, schema_namespace='diggs'):
+def extract_elements_from_node(node, schema_namespace='diggs'):
     """
     Recursively extract all elements from a node, handling nested sequences and choices.
     
     Args:
         node: The XML node to extract from
-        namespaces: Namespace dict for XPath
         schema_namespace: The namespace label (e.g., 'diggs', 'gml') for qualifying inline elements
     """
     elements = []
+    # Names already collected; the first occurrence of a name wins
+    seen = set()
     
     # Get all sequences at any level under this node
-    for seq in node.findall('.//xs:sequence', namespaces):
+    for seq in node.iter(XS_SEQUENCE):
         # Get direct element children of this sequence
-        for elem in seq.findall('xs:element', namespaces):
+        for elem in seq.iterfind(XS_ELEMENT):
             # Get element name - either from name attribute (inline) or ref attribute (reference)
             elem_name = elem.get('name')
             if elem_name:
@@ -137,19 +195,18 @@ def extract_elements_from_node(node, namespaces, schema_namespace='diggs'):
                 # Reference - ref ALWAYS has prefix in XSD, use as-is
                 elem_name = clean_type_name(elem.get('ref', ''))
             
-            elem_info = {
-                'name': elem_name,
-                'type': clean_type_name(elem.get('type', '')),
-                'minOccurs': elem.get('minOccurs', '1'),
-                'maxOccurs': elem.get('maxOccurs', '1'),
-            }
             # Avoid duplicates
-            if not any(e['name'] == elem_info['name'] for e in elements):
-                elements.append(elem_info)
+            if elem_name in seen:
+                continue
+            seen.add(elem_name)
+            elements.append(Elem(
+                elem_name, clean_type_name(elem.get('type', '')),
+                elem.get('minOccurs', '1'), elem.get('maxOccurs', '1'),
+            ))
     
     # Get all choices at any level
-    for choice in node.findall('.//xs:choice', namespaces):
-        for elem in choice.findall('xs:element', namespaces):
+    for choice in node.iter(XS_CHOICE):
+        for elem in choice.iterfind(XS_ELEMENT):
             elem_name = elem.get('name')
             if elem_name:
                 # Inline definition - name never has prefix, always qualify it
@@ -158,79 +215,68 @@ def extract_elements_from_node(node, namespaces, schema_namespace='diggs'):
                 # Reference - ref ALWAYS has prefix in XSD, use as-is
                 elem_name = clean_type_name(elem.get('ref', ''))
             
-            elem_info = {
-                'name': elem_name,
-                'type': clean_type_name(elem.get('type', '')),
-                'minOccurs': elem.get('minOccurs', '1'),
-                'maxOccurs': elem.get('maxOccurs', '1'),
-            }
-            if not any(e['name'] == elem_info['name'] for e in elements):
-                elements.append(elem_info)
+            if elem_name in seen:
+                continue
+            seen.add(elem_name)
+            elements.append(Elem(
+                elem_name, clean_type_name(elem.get('type', '')),
+                elem.get('minOccurs', '1'), elem.get('maxOccurs', '1'),
+            ))
     
     return elements
 
-def extract_local_elements(complex_type, namespaces, schema_namespace='diggs'):
+def extract_local_elements(complex_type, schema_namespace='diggs'):
     """Extract elements defined locally in this type
     
     Args:
         complex_type: The complexType element
-        namespaces: Namespace dict for XPath
         schema_namespace: The namespace label for qualifying inline elements
     """
     # Check for extension or restriction
-    extension = complex_type.find('.//xs:extension', namespaces)
+    extension = next(complex_type.iter(XS_EXTENSION), None)
     is_extension = extension is not None
     
-    restriction = complex_type.find('.//xs:restriction', namespaces)
+    restriction = next(complex_type.iter(XS_RESTRICTION), None)
     
     # Extract from the appropriate content model
     if extension is not None:
-        elements = extract_elements_from_node(extension, namespaces, schema_namespace)
+        elements = extract_elements_from_node(extension, schema_namespace)
     elif restriction is not None:
-        elements = extract_elements_from_node(restriction, namespaces, schema_namespace)
+        elements = extract_elements_from_node(restriction, schema_namespace)
     else:
-        elements = extract_elements_from_node(complex_type, namespaces, schema_namespace)
+        elements = extract_elements_from_node(complex_type, schema_namespace)
     
     return elements, is_extension
 
-def resolve_attribute_ref(attr_ref, all_attrs, namespaces):
+def resolve_attribute_ref(attr_ref, all_attrs):
     """Resolve an attribute reference to its definition
     
     Args:
         attr_ref: Qualified attribute reference like "gml:id" or "xml:lang"
         all_attrs: Dictionary of attribute definitions (with bare names as keys)
-        namespaces: Namespace dict
         
     Returns:
-        Dict with attribute info including the qualified name
+        Attr with the qualified name
     """
     # attr_ref is already qualified (e.g., "gml:id", "xml:lang")
     # For lookup in all_attrs, we need the bare name
-    bare_name = attr_ref.split(':')[-1] if ':' in attr_ref else attr_ref
+    bare_name = attr_ref.rpartition(':')[2]
     
     if bare_name in all_attrs:
         attr_def = all_attrs[bare_name]
-        return {
-            'name': attr_ref,  # Use the qualified reference as the name
-            'type': clean_type_name(attr_def.get('type', '')),
-            'use': 'optional',
-        }
+        # Use the qualified reference as the name
+        return Attr(attr_ref, clean_type_name(attr_def.get('type', '')), 'optional')
     
     # Attribute not found - might be from external schema
     # Return a placeholder so we don't lose track of it
-    return {
-        'name': attr_ref,
-        'type': '',
-        'use': 'optional',
-    }
+    return Attr(attr_ref, '', 'optional')
 
-def extract_local_attributes(complex_type, all_attrs, namespaces, schema_namespace='diggs'):
+def extract_local_attributes(complex_type, all_attrs, schema_namespace='diggs'):
     """Extract attributes from a complex type
     
     Args:
         complex_type: The complexType element
         all_attrs: Dictionary of global attribute definitions
-        namespaces: Namespace dict for XPath
         schema_namespace: The namespace label (NOT used for inline attributes per XML spec)
     
     Note: Per XML specification, attributes are unqualified by default.
@@ -238,28 +284,28 @@ def extract_local_attributes(complex_type, all_attrs, namespaces, schema_namespa
     """
     attributes = []
     
-    for attr in complex_type.findall('.//xs:attribute', namespaces):
+    for attr in complex_type.iter(XS_ATTRIBUTE):
         ref = attr.get('ref')
         if ref:
             # Attribute reference - ref has explicit prefix if qualified, use as-is
             # Examples: "xml:lang" (qualified), "gml:id" (qualified)
             attr_ref = clean_type_name(ref)
-            resolved_attr = resolve_attribute_ref(attr_ref, all_attrs, namespaces)
+            resolved_attr = resolve_attribute_ref(attr_ref, all_attrs)
             if resolved_attr:
                 use_override = attr.get('use')
                 if use_override:
-                    resolved_attr['use'] = use_override
+                    resolved_attr = resolved_attr._replace(use=use_override)
                 attributes.append(resolved_attr)
         else:
             # Inline attribute definition - attributes are UNQUALIFIED by default per XML spec
             # Example: name="uom" stays as "uom" (not "diggs:uom" or "eml:uom")
             attr_name = attr.get('name')
             
-            attr_info = {
-                'name': attr_name,  # Keep unqualified!
-                'type': clean_type_name(attr.get('type', '')),
-                'use': attr.get('use', 'optional'),
-            }
+            attr_info = Attr(
+                attr_name,  # Keep unqualified!
+                clean_type_name(attr.get('type', '')),
+                attr.get('use', 'optional'),
+            )
             attributes.append(attr_info)
     
     return attributes
@@ -271,8 +317,10 @@ def resolve_content_model(type_name, all_types, all_attrs, namespaces, visited=N
         type_name: Qualified type name like "diggs:AbstractFeature" or "eml:LengthMeasure"
         all_types: Dictionary with qualified names as keys
         all_attrs: Dictionary of attributes
-        namespaces: Namespace dict for XPath queries
-        visited: Set of visited types (for cycle detection)
+        namespaces: Namespace dict of the schema version; lookups match Clark-notation tags,
+            so it is only passed through for existing callers
+        visited: Set of visited types (for cycle detection); shared down the base chain,
+            which is safe as each call follows at most one base type
         depth: Recursion depth (for limiting)
     """
     if visited is None:
@@ -310,16 +358,16 @@ def resolve_content_model(type_name, all_types, all_attrs, namespaces, visited=N
         print(f"Warning: Invalid namespace extracted from '{type_name}', defaulting to 'diggs'")
     
     base_type_name = get_base_type_name(complex_type, namespaces)
-    local_elements, is_extension = extract_local_elements(complex_type, namespaces, schema_namespace)
-    local_attributes = extract_local_attributes(complex_type, all_attrs, namespaces, schema_namespace)
+    local_elements, is_extension = extract_local_elements(complex_type, schema_namespace)
+    local_attributes = extract_local_attributes(complex_type, all_attrs, schema_namespace)
     
-    elements_dict = OrderedDict()
-    attributes_dict = OrderedDict()
+    elements_dict = {}
+    attributes_dict = {}
     
     # If extension, inherit base content
     if is_extension and base_type_name:
         base_elements, base_attributes = resolve_content_model(
-            base_type_name, all_types, all_attrs, namespaces, visited.copy(), depth + 1
+            base_type_name, all_types, all_attrs, namespaces, visited, depth + 1
         )
         elements_dict.update(base_elements)
         attributes_dict.update(base_attributes)
@@ -327,70 +375,118 @@ def resolve_content_model(type_name, all_types, all_attrs, namespaces, visited=N
     # If restriction, attributes pass through
     elif base_type_name and not is_extension:
         _, base_attributes = resolve_content_model(
-            base_type_name, all_types, all_attrs, namespaces, visited.copy(), depth + 1
+            base_type_name, all_types, all_attrs, namespaces, visited, depth + 1
         )
         attributes_dict.update(base_attributes)
     
     # Add/override local elements
     for elem in local_elements:
-        elements_dict[elem['name']] = elem
+        elements_dict[elem.name] = elem
     
     # Add/override local attributes
     for attr in local_attributes:
-        attributes_dict[attr['name']] = attr
+        attributes_dict[attr.name] = attr
     
     return elements_dict, attributes_dict
 
-def content_models_match(cm1_elements, cm1_attrs, cm2_elements, cm2_attrs, strict=True):
+# Common minOccurs/maxOccurs values, looked up before falling back to parsing
+_MIN_OCCURS = {'0': 0, '1': 1}
+_MAX_OCCURS = {'0': 0, '1': 1, 'unbounded': 999999}
+
+def _occurs_value(value, common, default):
+    """Integer value of an occurrence attribute; default when it is not a plain integer"""
+    number = common.get(value)
+    if number is None:
+        number = int(value) if value.isdigit() else default
+    return number
+
+def content_models_match(cm1_elements, cm1_attrs, cm2_elements, cm2_attrs, strict=True,
+                         short_circuit=False):
+    """Compare two resolved content models
+    
+    With short_circuit, removed elements or attributes end the comparison early: the
+    models cannot match, and differences then only lists what was removed.
+    """
     differences = []
     
-    elem_names_1 = set(cm1_elements.keys())
-    elem_names_2 = set(cm2_elements.keys())
+    elem_names_1 = cm1_elements.keys()
+    elem_names_2 = cm2_elements.keys()
+    attr_names_1 = cm1_attrs.keys()
+    attr_names_2 = cm2_attrs.keys()
     
     removed_elems = elem_names_1 - elem_names_2
-    added_elems = elem_names_2 - elem_names_1
+    removed_attrs = attr_names_1 - attr_names_2
+    
+    if short_circuit and (removed_elems or removed_attrs):
+        if removed_elems:
+            differences.append(f"Elements removed: {', '.join(sorted(removed_elems)[:5])}")
+        if removed_attrs:
+            differences.append(f"Attributes removed: {', '.join(sorted(removed_attrs)[:5])}")
+        return False, differences
     
     if removed_elems:
-        differences.append(f"Elements removed: {', '.join(sorted(list(removed_elems))[:5])}")
-    if strict and added_elems:
-        differences.append(f"Elements added: {', '.join(sorted(list(added_elems))[:5])}")
+        differences.append(f"Elements removed: {', '.join(sorted(removed_elems)[:5])}")
+    if strict and not elem_names_2 <= elem_names_1:
+        added_elems = elem_names_2 - elem_names_1
+        differences.append(f"Elements added: {', '.join(sorted(added_elems)[:5])}")
     
     for elem_name in elem_names_1 & elem_names_2:
         e1 = cm1_elements[elem_name]
         e2 = cm2_elements[elem_name]
         
-        min1 = int(e1['minOccurs']) if e1['minOccurs'].isdigit() else 0
-        min2 = int(e2['minOccurs']) if e2['minOccurs'].isdigit() else 0
+        min1 = _occurs_value(e1.minOccurs, _MIN_OCCURS, 0)
+        min2 = _occurs_value(e2.minOccurs, _MIN_OCCURS, 0)
         
         if min2 > min1:
             differences.append(f"{elem_name}: minOccurs increased")
         
-        max1 = 999999 if e1['maxOccurs'] == 'unbounded' else int(e1['maxOccurs']) if e1['maxOccurs'].isdigit() else 1
-        max2 = 999999 if e2['maxOccurs'] == 'unbounded' else int(e2['maxOccurs']) if e2['maxOccurs'].isdigit() else 1
+        max1 = _occurs_value(e1.maxOccurs, _MAX_OCCURS, 1)
+        max2 = _occurs_value(e2.maxOccurs, _MAX_OCCURS, 1)
         
         if max2 < max1:
             differences.append(f"{elem_name}: maxOccurs decreased")
     
-    attr_names_1 = set(cm1_attrs.keys())
-    attr_names_2 = set(cm2_attrs.keys())
-    
-    removed_attrs = attr_names_1 - attr_names_2
-    added_attrs = attr_names_2 - attr_names_1
-    
     if removed_attrs:
-        differences.append(f"Attributes removed: {', '.join(sorted(list(removed_attrs))[:5])}")
-    if strict and added_attrs:
-        differences.append(f"Attributes added: {', '.join(sorted(list(added_attrs))[:5])}")
+        differences.append(f"Attributes removed: {', '.join(sorted(removed_attrs)[:5])}")
+    if strict and not attr_names_2 <= attr_names_1:
+        added_attrs = attr_names_2 - attr_names_1
+        differences.append(f"Attributes added: {', '.join(sorted(added_attrs)[:5])}")
     
     for attr_name in attr_names_1 & attr_names_2:
         a1 = cm1_attrs[attr_name]
         a2 = cm2_attrs[attr_name]
         
-        if a1['use'] == 'optional' and a2['use'] == 'required':
+        if a1.use == 'optional' and a2.use == 'required':
             differences.append(f"@{attr_name}: changed to required")
     
     return len(differences) == 0, differences
 
+# (all_types_26, all_attrs_26, all_types_3, all_attrs_3) in a worker process; set by _init_worker
+_worker_indexes = None
+
+def _init_worker(indexes):
+    global _worker_indexes
+    _worker_indexes = indexes
+
+def _check_type(type_name, short_circuit=False):
+    """Resolve a type in both versions and compare the content models, in a worker process
+    
+    Returns ((v2.6 elements, v2.6 attributes, v3.0 elements, v3.0 attributes), match, differences)
+    """
+    all_types_26, all_attrs_26, all_types_3, all_attrs_3 = _worker_indexes
+    cm26_elements, cm26_attrs = resolve_content_model(
+        type_name, all_types_26, all_attrs_26, NS_26
+    )
+    cm3_elements, cm3_attrs = resolve_content_model(
+        type_name, all_types_3, all_attrs_3, NS_3
+    )
+    match, differences = content_models_match(
+        cm26_elements, cm26_attrs, cm3_elements, cm3_attrs, strict=False,
+        short_circuit=short_circuit
+    )
+    sizes = (len(cm26_elements), len(cm26_attrs), len(cm3_elements), len(cm3_attrs))
+    return sizes, match, differences
+
 def main():
     print("=" * 80)
     print("Fixed Content Model Resolver - Handles Nested Sequences")
@@ -406,8 +502,7 @@ def main():
         parse_schema('/mnt/user-data/uploads/Kernel.xsd', NS_26),
         parse_schema('/mnt/user-data/uploads/gml3_2Profile_diggs.xsd', NS_26),
     ]
-    all_types_26 = get_all_types(v26_schemas, NS_26)
-    all_attrs_26 = get_all_attributes(v26_schemas, NS_26)
+    all_types_26, all_attrs_26, _ = index_schemas(v26_schemas, NS_26)
     print(f"    Found {len(all_types_26)} types and {len(all_attrs_26)} global attributes in v2.6")
     
     v3_files = [
@@ -425,8 +520,7 @@ def main():
         if schema is not None:
             v3_schemas.append(schema)
     
-    all_types_3 = get_all_types(v3_schemas, NS_3)
-    all_attrs_3 = get_all_attributes(v3_schemas, NS_3)
+    all_types_3, all_attrs_3, _ = index_schemas(v3_schemas, NS_3)
     print(f"    Found {len(all_types_3)} types and {len(all_attrs_3)} global attributes in v3.0")
     
     print("\nTesting fix on AbstractComponentObjectType...")
@@ -453,62 +547,58 @@ def main():
     print("\nFinding all types marked as incompatible...")
     types_to_check = []
     
-    for row in range(2, ws.max_row + 1):
-        type_name = ws.cell(row, 1).value
-        compatible = ws.cell(row, 11).value
+    # One pass over the rows; only the columns read below are kept
+    for row, values in enumerate(ws.iter_rows(min_row=2, max_col=11, values_only=True), 2):
+        type_name, type_removed, compatible = values[0], values[1], values[10]
         
         if compatible == 'No':
-            types_to_check.append(row)
+            types_to_check.append((row, type_name, type_removed))
     
     print(f"  Found {len(types_to_check)} types marked as incompatible")
     
     updated_count = 0
     checked_count = 0
     
-    for row in types_to_check:
-        type_name = ws.cell(row, 1).value
-        type_removed = ws.cell(row, 2).value
-        if type_removed == 'Yes':
-            continue
-        
-        checked_count += 1
-        
-        if checked_count <= 5 or checked_count % 10 == 0:
-            print(f"\n  [{checked_count}/{len(types_to_check)}] Analyzing: {type_name}")
+    # Removed types have nothing to resolve in v3.0
+    to_analyze = [(row, type_name) for row, type_name, type_removed in types_to_check
+                  if type_removed != 'Yes']
+    
+    # Types are resolved and compared in worker processes; the sheet is only
+    # updated here, in the order of its rows
+    indexes = (all_types_26, all_attrs_26, all_types_3, all_attrs_3)
+    with ProcessPoolExecutor(initializer=_init_worker, initargs=(indexes,)) as pool:
+        # Differences are only printed for the first five types; the rest just need the verdict
+        outcomes = pool.map(_check_type, [type_name for _, type_name in to_analyze],
+                            [idx >= 5 for idx in range(len(to_analyze))], chunksize=32)
         
-        cm26_elements, cm26_attrs = resolve_content_model(
-            type_name, all_types_26, all_attrs_26, NS_26
-        )
-        cm3_elements, cm3_attrs = resolve_content_model(
-            type_name, all_types_3, all_attrs_3, NS_3
-        )
-        
-        if checked_count <= 5:
-            print(f"    v2.6 content: {len(cm26_elements)} elements, {len(cm26_attrs)} attributes")
-            print(f"    v3.0 content: {len(cm3_elements)} elements, {len(cm3_attrs)} attributes")
-        
-        match, differences = content_models_match(
-            cm26_elements, cm26_attrs, cm3_elements, cm3_attrs, strict=False
-        )
-        
-        if match:
-            if checked_count <= 5:
-                print(f"    ✓ Content models COMPATIBLE - updating")
-            ws.cell(row, 11).value = 'Yes'
-            ws.cell(row, 11).fill = PatternFill(start_color='C6EFCE', end_color='C6EFCE', fill_type='solid')
+        for (row, type_name), (sizes, match, differences) in zip(to_analyze, outcomes):
+            checked_count += 1
             
-            current_notes = ws.cell(row, 10).value or ''
-            if current_notes:
-                ws.cell(row, 10).value = current_notes + '; Content model analysis confirms compatibility'
-            else:
-                ws.cell(row, 10).value = 'Content model analysis confirms compatibility'
+            if checked_count <= 5 or checked_count % 10 == 0:
+                print(f"\n  [{checked_count}/{len(types_to_check)}] Analyzing: {type_name}")
             
-            updated_count += 1
-        else:
             if checked_count <= 5:
-                print(f"    ✗ Content models INCOMPATIBLE:")
-                for diff in differences[:2]:
-                    print(f"      - {diff}")
+                print(f"    v2.6 content: {sizes[0]} elements, {sizes[1]} attributes")
+                print(f"    v3.0 content: {sizes[2]} elements, {sizes[3]} attributes")
+            
+            if match:
+                if checked_count <= 5:
+                    print(f"    ✓ Content models COMPATIBLE - updating")
+                ws.cell(row, 11).value = 'Yes'
+                ws.cell(row, 11).fill = GREEN_FILL
+                
+                current_notes = ws.cell(row, 10).value or ''
+                if current_notes:
+                    ws.cell(row, 10).value = current_notes + '; Content model analysis confirms compatibility'
+                else:
+                    ws.cell(row, 10).value = 'Content model analysis confirms compatibility'
+                
+                updated_count += 1
+            else:
+                if checked_count <= 5:
+                    print(f"    ✗ Content models INCOMPATIBLE:")
+                    for diff in differences[:2]:
+                        print(f"      - {diff}")
     
     output_file = '/mnt/user-data/outputs/DIGGS_v26_to_v30_Comparison_FINAL.xlsx'
     wb.save(output_file)
@@ -4,71 +4,110 @@ Installation Verification Script
 Tests that all required components are properly installed
 """
 
+import contextlib
+import importlib.util
+import io
+import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
+
+# Modules the analyzer needs; kept in step with requirements.txt
+REQUIRED_MODULES = ('openpyxl', 'lxml')
+
+# Files expected next to this script, in report order
+REQUIRED_FILES = ('diggs_compatibility_analyzer.py', 'fixed_resolver.py', 'README.md')
+
+# Rule printed around the report
+_SEP = '=' * 60
+
+# Status lines for the module and file checks
+_MSGS = {
+    'module_ok': "✓ {0} is installed",
+    'module_missing': "✗ {0} is NOT installed\n  Install with: pip3 install {0}",
+    'file_ok': "✓ {0} found",
+    'file_missing': "✗ {0} NOT found",
+}
 
 def check_python_version():
     """Check Python version"""
     version = sys.version_info
-    if version.major >= 3 and version.minor >= 7:
-        print(f"✓ Python version: {version.major}.{version.minor}.{version.micro}")
-        return True
-    else:
-        print(f"✗ Python version: {version.major}.{version.minor}.{version.micro}")
+    # Compare (major, minor) as a tuple so later major versions pass as well
+    ok = version[:2] >= (3, 7)
+    print(f"{'✓' if ok else '✗'} Python version: {version.major}.{version.minor}.{version.micro}")
+    if not ok:
         print("  Required: Python 3.7 or higher")
-        return False
+    return ok
 
-def check_module(module_name):
-    """Check if a module is installed"""
+def _module_installed(module_name):
+    """Whether a module can be found, without importing it"""
     try:
-        __import__(module_name)
-        print(f"✓ {module_name} is installed")
-        return True
-    except ImportError:
-        print(f"✗ {module_name} is NOT installed")
-        print(f"  Install with: pip3 install {module_name}")
+        return importlib.util.find_spec(module_name) is not None
+    except (ImportError, ValueError):
         return False
 
+def _report_module(module_name, installed):
+    """Print the status line for one module"""
+    print(_MSGS['module_ok' if installed else 'module_missing'].format(module_name))
+
+# Directory listings keyed by (path, mtime_ns); adding or removing an entry
+# changes the directory's mtime, so a stale listing is never reused
+_DIR_CACHE = {}
+
+def _directory_entries(path):
+    """Names in a directory, re-read only when the directory has changed"""
+    key = (path, os.stat(path).st_mtime_ns)
+    entries = _DIR_CACHE.get(key)
+    if entries is None:
+        entries = frozenset(os.listdir(path))
+        _DIR_CACHE[key] = entries
+    return entries
+
 def check_files():
     """Check if required files exist"""
-    import os
-    files = [
-        'diggs_compatibility_analyzer.py',
-        'fixed_resolver.py',
-        'README.md'
-    ]
+    # One directory read instead of a stat() per file
+    present = _directory_entries(os.getcwd())
     
-    all_exist = True
-    for filename in files:
-        if os.path.exists(filename):
-            print(f"✓ {filename} found")
-        else:
-            print(f"✗ {filename} NOT found")
-            all_exist = False
+    for filename in REQUIRED_FILES:
+        print(_MSGS['file_ok' if filename in present else 'file_missing'].format(filename))
     
-    return all_exist
+    return present.issuperset(REQUIRED_FILES)
 
-def main():
-    print("="*60)
+def check_modules():
+    """Check every required module"""
+    # Look the modules up concurrently, then report them in order so the
+    # output never interleaves
+    with ThreadPoolExecutor(max_workers=len(REQUIRED_MODULES)) as pool:
+        results = list(pool.map(_module_installed, REQUIRED_MODULES))
+    for module_name, installed in zip(REQUIRED_MODULES, results):
+        _report_module(module_name, installed)
+    return all(results)
+
+# (heading, check) pairs, run in order
+CHECKS = (
+    ("Checking Python version...", check_python_version),
+    ("Checking required modules...", check_modules),
+    ("Checking required files...", check_files),
+)
+
+def run_checks():
+    """Run every check, printing the report"""
+    print(_SEP)
     print("DIGGS Compatibility Analyzer - Installation Check")
-    print("="*60)
-    print()
-    
-    checks = []
-    
-    print("Checking Python version...")
-    checks.append(check_python_version())
+    print(_SEP)
     print()
     
-    print("Checking required modules...")
-    checks.append(check_module('openpyxl'))
-    checks.append(check_module('lxml'))
-    print()
+    # DIGGS_VERIFY_FAST=1 stops at the first failing check
+    fast = os.environ.get('DIGGS_VERIFY_FAST') == '1'
     
-    print("Checking required files...")
-    checks.append(check_files())
-    print()
+    checks = []
+    for heading, check in CHECKS:
+        print(heading)
+        checks.append(check())
+        print()
+        if fast and not checks[-1]:
+            break
     
-    print("="*60)
+    print(_SEP)
     if all(checks):
         print("✓ All checks passed! Ready to analyze DIGGS schemas.")
         print()
@@ -81,7 +120,15 @@ def main():
         print()
         print("To install required packages:")
         print("  pip3 install -r requirements.txt")
-    print("="*60)
+    print(_SEP)
+
+def main():
+    # The report is collected and written out in one go rather than line by line
+    report = io.StringIO()
+    with contextlib.redirect_stdout(report):
+        run_checks()
+    sys.stdout.write(report.getvalue())
+    sys.stdout.flush()
 
 if __name__ == '__main__':
     main()